@@ -4,25 +4,29 @@ Main FastAPI application for the Multi-Agent Negotiation Framework with ADK inte
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 import uvicorn
 from loguru import logger
 import asyncio
-from typing import List, Dict, Any
-import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
+import orjson
 
 # Import our modules
-from models.debate import DebateSession, Agent, DebateMessage
+from models.debate import DebateSession, Agent, DebateMessage, DEBATE_MESSAGE_LIST_ADAPTER
 from services.agent_service import AgentService
 from services.debate_service import DebateService
 from services.memory_service import MemoryService
+from services.llm_service import close_shared_http_client
 from utils.config import get_settings
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Multi-Agent Negotiation Framework (ADK-powered)",
     description="A sophisticated system for creating autonomous, multi-agent debates using Google ADK",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -34,10 +38,54 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global variables for WebSocket connections and ADK orchestrators
-active_connections: List[WebSocket] = []
-debate_sessions: Dict[str, DebateSession] = {}
+@dataclass(eq=False)  # Identity-hashed so channels can live in sets
+class Channel:
+    """A connected WebSocket with its own bounded outbound queue and relay task"""
+    websocket: WebSocket
+    binary: bool = False  # Client negotiated BINARY_SUBPROTOCOL and reads binary frames
+    queue: asyncio.Queue = field(
+        default_factory=lambda: asyncio.Queue(maxsize=settings.websocket_message_queue_size)
+    )
+    relay_task: Optional[asyncio.Task] = None
+    dropped: int = 0  # Payloads discarded since the relay last caught up with the queue
+    close_code: Optional[int] = None
+    
+    def send(self, payload: bytes) -> bool:
+        """Queue a payload without blocking, dropping the oldest one if the client is behind"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            if self.dropped % self.queue.maxsize == 1:
+                logger.warning(f"Outbound WebSocket queue full, dropped {self.dropped} payloads in this backlog")
+            if self.dropped >= self.queue.maxsize:
+                # A whole queue's worth behind without ever catching up: ask the client to retry later
+                logger.warning("Disconnecting chronically slow WebSocket client")
+                self.close(code=1013)
+                return False
+        self.queue.put_nowait(payload)
+        return True
+    
+    def close(self, code: Optional[int] = None):
+        """Stop relaying to this client, optionally closing it with the given code"""
+        if code is not None:
+            self.close_code = code
+        if self.relay_task and not self.relay_task.done():
+            self.relay_task.cancel()
+
+# Clients offering this subprotocol get pre-encoded UTF-8 JSON as binary frames; others get text frames
+BINARY_SUBPROTOCOL = "json.binary"
+
+# Global variables for WebSocket connections and ADK orchestrators.
+# Redis is the authoritative session store so any worker can serve any session;
+# these dicts only hold what lives in this worker process.
+session_channels: Dict[str, Set[Channel]] = defaultdict(set)  # WebSocket channels per session
+session_heartbeats: Dict[str, asyncio.Task] = {}  # One snapshot broadcaster per session with local channels
+debate_sessions: Dict[str, DebateSession] = {}  # Live sessions hosted by this worker
 debate_services: Dict[str, DebateService] = {}  # Track ADK orchestrators per session
+session_update_listener: Optional[asyncio.Task] = None  # Redis pub/sub -> local WebSockets
+health_refresher: Optional[asyncio.Task] = None  # Keeps health_state current in the background
+service_warmup: Optional[asyncio.Task] = None  # One-off priming of the ADK client and agent generation prompt
+health_state: Dict[str, bool] = {"redis": False, "chromadb": False}
 
 # Initialize services
 settings = get_settings()
@@ -49,18 +97,30 @@ async def startup_event():
     """Initialize services on startup"""
     logger.info("Starting Multi-Agent Negotiation Framework with ADK")
     await memory_service.initialize()
+    global session_update_listener, health_refresher, service_warmup
+    session_update_listener = asyncio.create_task(relay_session_updates())
+    # Probe once before serving so /health never reports the placeholder state
+    await probe_health()
+    health_refresher = asyncio.create_task(refresh_health())
+    service_warmup = asyncio.create_task(agent_service.warm_up())
     # TODO: Initialize any global ADK resources if needed
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down Multi-Agent Negotiation Framework")
-    # Cleanup all active ADK orchestrators
-    for session_id, debate_service in debate_services.items():
-        if debate_service.orchestrator:
-            logger.info(f"Shutting down ADK orchestrator for session {session_id}")
-            # TODO: Add proper ADK orchestrator cleanup
-    await memory_service.cleanup()
+    for task in (session_update_listener, health_refresher, service_warmup, *session_heartbeats.values()):
+        if task:
+            task.cancel()
+    # Cleanup all active ADK orchestrators concurrently so one slow session cannot hold up the rest
+    results = await asyncio.gather(
+        *(debate_service.shutdown() for debate_service in debate_services.values()),
+        return_exceptions=True
+    )
+    for session_id, result in zip(debate_services, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error shutting down ADK orchestrator for session {session_id}: {result}")
+    await asyncio.gather(memory_service.cleanup(), close_shared_http_client())
 
 @app.get("/")
 async def root():
@@ -72,14 +132,28 @@ async def root():
         "adk_enabled": True
     }
 
+async def probe_health():
+    """Probe Redis and ChromaDB once and record the results in health_state"""
+    redis_ok, chromadb_ok = await asyncio.gather(
+        memory_service.check_redis_connection(),
+        memory_service.check_chromadb_connection()
+    )
+    health_state["redis"] = redis_ok
+    health_state["chromadb"] = chromadb_ok
+
+async def refresh_health():
+    """Re-probe periodically so /health never waits on a backend round trip; startup runs the first probe"""
+    while True:
+        await asyncio.sleep(settings.health_check_interval)
+        await probe_health()
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (served from the last background probe)"""
     return {
-        "status": "healthy",
+        "status": "healthy" if all(health_state.values()) else "degraded",
         "services": {
-            "redis": await memory_service.check_redis_connection(),
-            "chromadb": await memory_service.check_chromadb_connection(),
+            **health_state,
             "adk": True  # TODO: Add actual ADK health check
         }
     }
@@ -96,59 +170,84 @@ async def start_debate_session(scenario: str, agent_count: int = 5):
         session_id = await debate_service.create_session(scenario, agents)
         
         # Store session and debate service
-        debate_sessions[session_id] = DebateSession(
+        session = DebateSession(
             id=session_id,
             scenario=scenario,
             agents=agents,
             status="created"
         )
+        debate_sessions[session_id] = session
         debate_services[session_id] = debate_service
         
         logger.info(f"Created ADK debate session: {session_id}")
         
-        return {
+        return _json_response({
             "session_id": session_id,
-            "agents": [agent.model_dump() for agent in agents],
+            "agents": orjson.Fragment(session.agents_json()),
             "status": "created",
             "adk_orchestrator": "initialized"
-        }
+        })
     
     except Exception as e:
         logger.error(f"Error starting ADK debate session: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _json_response(content: Dict[str, Any]) -> Response:
+    """Encode a response body directly, splicing in pre-encoded orjson fragments"""
+    return Response(content=orjson.dumps(content), media_type="application/json")
+
+async def _load_session(session_id: str) -> DebateSession:
+    """Get a session from this worker if it hosts it, otherwise from Redis"""
+    session = debate_sessions.get(session_id) or await memory_service.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+async def _get_debate_service(session: DebateSession) -> DebateService:
+    """Get this worker's debate service for a session, rebuilding it if another worker created it"""
+    debate_service = debate_services.get(session.id)
+    if debate_service is None:
+        debate_service = DebateService(memory_service)
+        await debate_service.register_agents(session.agents)
+        debate_services[session.id] = debate_service
+        debate_sessions[session.id] = session
+    return debate_service
+
+def _session_update(session: DebateSession) -> str:
+    """Encode the session_update event using this worker's orchestrator state"""
+    debate_service = debate_services.get(session.id)
+    return session.session_update_json(bool(debate_service and debate_service.orchestrator))
+
+async def _persist_session_change(session: DebateSession):
+    """Write a session mutation to Redis and publish it to WebSocket clients on every worker"""
+    await memory_service.store_session(session)
+    await memory_service.publish_session_update(session.id, _session_update(session))
+
 @app.get("/api/v1/sessions/{session_id}")
 async def get_session_status(session_id: str):
     """Get the status of a debate session"""
-    if session_id not in debate_sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = debate_sessions[session_id]
+    session = await _load_session(session_id)
     debate_service = debate_services.get(session_id)
     
-    return {
+    return _json_response({
         "session_id": session_id,
         "scenario": session.scenario,
-        "agents": [agent.model_dump() for agent in session.agents],
+        "agents": orjson.Fragment(session.agents_json()),
         "status": session.status,
         "current_round": session.current_round,
         "consensus_reached": session.consensus_reached,
         "adk_orchestrator": "active" if debate_service and debate_service.orchestrator else "inactive"
-    }
+    })
 
 @app.post("/api/v1/sessions/{session_id}/start-debate")
 async def start_debate(session_id: str):
     """Start the actual ADK debate for a session"""
-    if session_id not in debate_sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    if session_id not in debate_services:
-        raise HTTPException(status_code=404, detail="ADK debate service not found")
+    session = await _load_session(session_id)
     
     try:
-        session = debate_sessions[session_id]
-        debate_service = debate_services[session_id]
+        debate_service = await _get_debate_service(session)
         session.status = "debating"
+        await _persist_session_change(session)
         
         # Start the ADK debate engine
         await debate_service.start_debate(session_id, session)
@@ -166,11 +265,9 @@ async def start_debate(session_id: str):
 @app.post("/api/v1/sessions/{session_id}/pause")
 async def pause_debate(session_id: str):
     """Pause the debate"""
-    if session_id not in debate_sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = debate_sessions[session_id]
+    session = await _load_session(session_id)
     session.status = "paused"
+    await _persist_session_change(session)
     
     # TODO: Add ADK orchestrator pause functionality
     
@@ -179,11 +276,9 @@ async def pause_debate(session_id: str):
 @app.post("/api/v1/sessions/{session_id}/resume")
 async def resume_debate(session_id: str):
     """Resume the debate"""
-    if session_id not in debate_sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = debate_sessions[session_id]
+    session = await _load_session(session_id)
     session.status = "debating"
+    await _persist_session_change(session)
     
     # TODO: Add ADK orchestrator resume functionality
     
@@ -192,14 +287,10 @@ async def resume_debate(session_id: str):
 @app.post("/api/v1/sessions/{session_id}/consensus")
 async def trigger_consensus(session_id: str):
     """Manually trigger consensus evaluation"""
-    if session_id not in debate_sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    if session_id not in debate_services:
-        raise HTTPException(status_code=404, detail="ADK debate service not found")
+    session = await _load_session(session_id)
     
     try:
-        debate_service = debate_services[session_id]
+        debate_service = await _get_debate_service(session)
         result = await debate_service.evaluate_consensus(session_id)
         return {
             "message": "Consensus evaluation triggered",
@@ -215,9 +306,11 @@ async def trigger_consensus(session_id: str):
 async def get_sessions():
     """Get all debate sessions"""
     sessions_list = []
-    for session_id, session in debate_sessions.items():
+    for stored in await memory_service.list_sessions():
+        # Prefer the live object when this worker is running the debate
+        session = debate_sessions.get(stored.id, stored)
         sessions_list.append({
-            "session_id": session_id,
+            "session_id": session.id,
             "scenario": session.scenario,
             "status": session.status,
             "current_round": session.current_round,
@@ -228,52 +321,151 @@ async def get_sessions():
     return sessions_list
 
 @app.get("/api/v1/sessions/{session_id}/messages")
-async def get_session_messages(session_id: str):
-    """Get all messages for a debate session"""
-    if session_id not in debate_sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = debate_sessions[session_id]
-    return session.messages
+async def get_session_messages(session_id: str, after: int = 0, limit: Optional[int] = None):
+    """
+    Get messages for a debate session in chronological order.
+    Pass `limit` to page through the log; X-Next-After holds the `after` for the next page.
+    """
+    after = max(after, 0)
+    session = debate_sessions.get(session_id)
+    try:
+        if session is None:
+            if not await memory_service.session_exists(session_id):
+                raise HTTPException(status_code=404, detail="Session not found")
+            messages, total = await memory_service.get_session_messages_page(session_id, after, limit)
+        else:
+            messages, total = await _local_session_messages_page(session, after, limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Message log unavailable: {e}")
+    headers = {"X-Total-Count": str(total)}
+    next_after = after + len(messages)
+    if next_after < total:
+        headers["X-Next-After"] = str(next_after)
+    return Response(
+        content=DEBATE_MESSAGE_LIST_ADAPTER.dump_json(messages),
+        media_type="application/json",
+        headers=headers
+    )
+
+async def _local_session_messages_page(
+    session: DebateSession, after: int, limit: Optional[int]
+) -> Tuple[List[DebateMessage], int]:
+    """
+    A page of a session hosted by this worker. Its in-memory window is ahead of Redis (each round is
+    persisted in the background during the next one), so the window serves the tail and Redis only
+    what has been trimmed out of memory.
+    """
+    total = session.message_count
+    window_start = total - len(session.messages)
+    end = total if limit is None else min(total, after + max(limit, 0))
+    # The log must not expire while this worker still serves the session
+    await memory_service.keep_session_alive(session.id)
+    stored: List[DebateMessage] = []
+    if after < window_start and after < end:
+        stored, _ = await memory_service.get_session_messages_page(
+            session.id, after, min(end, window_start) - after
+        )
+    recent = session.messages[max(after - window_start, 0):max(end - window_start, 0)]
+    return stored + recent, total
+
+def _unsubscribe(session_id: str, channel: Channel):
+    """Remove a channel from its session, dropping the session entry and heartbeat once empty"""
+    channels = session_channels.get(session_id)
+    if channels is not None:
+        channels.discard(channel)
+        if not channels:
+            del session_channels[session_id]
+            heartbeat = session_heartbeats.pop(session_id, None)
+            if heartbeat:
+                heartbeat.cancel()
+
+async def relay(session_id: str, channel: Channel):
+    """Drain a channel's outbound queue into its WebSocket, coalescing bursts into one frame"""
+    try:
+        while True:
+            batch = [await channel.queue.get()]
+            # Give bursts a moment to pile up, then flush them as one frame
+            if settings.websocket_batch_window > 0:
+                await asyncio.sleep(settings.websocket_batch_window)
+            while not channel.queue.empty():
+                batch.append(channel.queue.get_nowait())
+            
+            # Payloads are already encoded, so a batch is just their JSON array
+            frame = batch[0] if len(batch) == 1 else b"[" + b",".join(batch) + b"]"
+            if channel.binary:
+                await channel.websocket.send_bytes(frame)
+            else:
+                await channel.websocket.send_text(frame.decode())
+            # Caught up with everything queued, so earlier bursts no longer count against the client
+            if channel.queue.empty():
+                channel.dropped = 0
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.debug(f"WebSocket relay stopped: {e}")
+    finally:
+        _unsubscribe(session_id, channel)
 
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     """WebSocket endpoint for real-time debate updates with ADK events"""
-    await websocket.accept()
-    active_connections.append(websocket)
+    binary = BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol=BINARY_SUBPROTOCOL if binary else None)
+    channel = Channel(websocket, binary=binary)
+    channel.relay_task = asyncio.create_task(relay(session_id, channel))
+    session_channels[session_id].add(channel)
+    if session_id not in session_heartbeats:
+        session_heartbeats[session_id] = asyncio.create_task(session_heartbeat(session_id))
     
     try:
-        while True:
-            # Send real-time updates to connected clients
-            if session_id in debate_sessions:
-                session = debate_sessions[session_id]
-                debate_service = debate_services.get(session_id)
-                
-                await websocket.send_text(json.dumps({
-                    "type": "session_update",
-                    "session_id": session_id,
-                    "status": session.status,
-                    "current_round": session.current_round,
-                    "consensus_reached": session.consensus_reached,
-                    "adk_orchestrator": "active" if debate_service and debate_service.orchestrator else "inactive"
-                    # TODO: Add ADK-specific events (agent actions, A2A messages, etc.)
-                }))
-            
-            # Wait before next update
-            await asyncio.sleep(1)
+        # Live updates reach this channel through relay_session_updates and periodic
+        # snapshots through session_heartbeat; here we only send the initial snapshot
+        # and wait for the relay task, which ends once the client goes away.
+        session = debate_sessions.get(session_id) or await memory_service.get_session(session_id)
+        if session:
+            channel.send(_session_update(session).encode())
+        await asyncio.wait({channel.relay_task})
     
-    except WebSocketDisconnect:
-        active_connections.remove(websocket)
-
-async def broadcast_message(message: Dict[str, Any]):
-    """Broadcast message to all connected WebSocket clients"""
-    if active_connections:
-        for connection in active_connections:
+    finally:
+        channel.close()
+        _unsubscribe(session_id, channel)
+        if channel.close_code is not None:
             try:
-                await connection.send_text(json.dumps(message))
-            except:
-                # Remove broken connections
-                active_connections.remove(connection)
+                await websocket.close(code=channel.close_code)
+            except Exception:
+                pass  # Already gone
+
+def _fan_out(session_id: str, payload: Union[str, bytes]):
+    """Queue an encoded payload for every WebSocket of a session connected to this worker"""
+    if isinstance(payload, str):
+        payload = payload.encode()  # Once per broadcast, not once per client
+    for channel in list(session_channels.get(session_id, ())):
+        channel.send(payload)
+
+async def session_heartbeat(session_id: str):
+    """Encode one snapshot per heartbeat and queue it for every local WebSocket of a session"""
+    while True:
+        await asyncio.sleep(settings.websocket_heartbeat)
+        try:
+            session = debate_sessions.get(session_id) or await memory_service.get_session(session_id)
+            if session:
+                _fan_out(session_id, _session_update(session))
+        except Exception as e:
+            logger.error(f"Heartbeat for session {session_id} failed: {e}")
+
+async def relay_session_updates():
+    """Forward session updates published by any worker to this worker's WebSocket clients"""
+    while True:
+        try:
+            async for session_id, payload in memory_service.subscribe_session_updates():
+                _fan_out(session_id, payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Session update listener failed, resubscribing: {e}")
+            await asyncio.sleep(1)
 
 # TODO: Add endpoints for ADK-specific functionality:
 # - Agent introspection
@@ -282,4 +474,15 @@ async def broadcast_message(message: Dict[str, Any]):
 # - Real-time agent state monitoring
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # Workers need the import string; sessions are shared through Redis
+    uvicorn.run(
+        "main:app",
+        host=settings.api_host,
+        port=settings.api_port,
+        workers=settings.api_workers,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_max_queue=settings.websocket_max_queue,
+        ws_max_size=settings.websocket_max_size
+    ) 
\ No newline at end of file
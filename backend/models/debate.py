@@ -2,11 +2,38 @@
 Data models for the Multi-Agent Negotiation Framework with ADK and A2A protocol support
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional, Union
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Discriminator, Field, PlainSerializer, PrivateAttr, Tag, TypeAdapter, field_validator
+from typing import Annotated, List, Dict, Any, Literal, Optional, Tuple, Union
 from enum import Enum
-from datetime import datetime
-import uuid
+from datetime import datetime, timezone
+import heapq
+import sys
+import time
+import secrets
+from functools import partial
+import orjson
+
+from utils.retrieval import bm25_scores
+
+# 128 random bits as 32 hex chars, without building a UUID object; partial keeps it a C-level call
+new_id = partial(secrets.token_hex, 16)
+
+def ns_to_iso(timestamp_ns: int) -> str:
+    """Render an epoch-nanosecond timestamp as an ISO 8601 UTC string"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat()
+
+def _to_epoch_ns(value: Any) -> Any:
+    """Accept ISO strings and datetimes from older stored messages"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1_000_000) * 1000
+    return value
+
+# Epoch nanoseconds from time.time_ns(); ISO 8601 on the wire
+EpochNs = Annotated[int, BeforeValidator(_to_epoch_ns), PlainSerializer(ns_to_iso, return_type=str, when_used="json")]
 
 class DebateStatus(str, Enum):
     """Debate session status"""
@@ -31,15 +58,21 @@ class A2AMessageType(str, Enum):
     NOTIFICATION = "notification"
     ERROR = "error"
 
+# Field types: literal validation is a plain string lookup in pydantic-core, cheaper than
+# enum validation. The enums above stay for callers that want named members.
+DebateStatusLiteral = Literal["created", "debating", "paused", "consensus_reached", "ended"]
+MessageTypeLiteral = Literal["argument", "response", "consensus_proposal", "system_message", "a2a_message"]
+A2AMessageTypeLiteral = Literal["request", "response", "notification", "error"]
+
 class Agent(BaseModel):
     """Agent model representing a debate participant with ADK compatibility"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     name: str
     role: str  # Open-ended, LLM-driven
     personality: str  # Open-ended, LLM-driven
-    goals: List[str]
-    constraints: List[str]
-    expertise: List[str]
+    goals: Tuple[str, ...]
+    constraints: Tuple[str, ...]
+    expertise: Tuple[str, ...]
     initial_stance: str
     reasoning_style: str
     communication_style: str
@@ -59,42 +92,66 @@ class Agent(BaseModel):
     llm_provider: Optional[str] = None  # Which LLM provider to use for this agent
     llm_config: Dict[str, Any] = Field(default_factory=dict)  # LLM-specific configuration
     
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
+    
+    @field_validator("goals", "constraints", "expertise")
+    @classmethod
+    def _intern_items(cls, value: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Intern the short, frequently repeated vocabulary shared across a session's agents"""
+        return tuple(sys.intern(item) for item in value)
+
+    @field_validator("role", "reasoning_style", "communication_style")
+    @classmethod
+    def _intern_labels(cls, value: str) -> str:
+        """Short labels like "Logical" or "Clear and direct" recur across agents and cached lineups"""
+        return sys.intern(value)
 
 class A2AMessage(BaseModel):
     """A2A protocol message structure"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    message_type: A2AMessageType
+    id: str = Field(default_factory=new_id)
+    message_type: A2AMessageTypeLiteral
     sender: str  # Agent name or ID
     receiver: Optional[str] = None  # Target agent (None for broadcast)
     content: str
     metadata: Dict[str, Any] = Field(default_factory=dict)
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: EpochNs = Field(default_factory=time.time_ns)
     correlation_id: Optional[str] = None  # For request-response correlation
     
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
+
+class MessageMetadata(BaseModel):
+    """How a debate message was produced; typed so the per-message serializer avoids the Any path"""
+    llm_provider: Optional[str] = None
+    llm_model: Optional[str] = None
+    tokens_used: Optional[int] = None
+    finish_reason: Optional[str] = None
+    error: Optional[str] = None  # Set on fallback messages when generation failed
+    
+    model_config = ConfigDict(extra="allow")  # Older stored messages may carry other keys
 
 class DebateMessage(BaseModel):
     """Model for debate messages between agents with A2A protocol support"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     session_id: str
     agent_id: str
     agent_name: str
-    message_type: MessageType
+    message_type: MessageTypeLiteral
     content: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: EpochNs = Field(default_factory=time.time_ns)
     round_number: int
     response_to: Optional[str] = None
-    metadata: Dict[str, Any] = {}
+    metadata: MessageMetadata = Field(default_factory=MessageMetadata)
     
     # A2A protocol fields
-    a2a_message: Optional[A2AMessage] = None  # Original A2A message if applicable
-    a2a_correlation_id: Optional[str] = None  # Link to A2A message chain
+    a2a_correlation_id: Optional[str] = None  # Link to the A2A message chain (kept in a2a_messages:{session_id})
     
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
+    
+    @field_validator("session_id", "agent_id", "agent_name")
+    @classmethod
+    def _intern_ids(cls, value: str) -> str:
+        """Share one string per session/agent across the thousands of messages that repeat it"""
+        return sys.intern(value)
 
 class ConsensusResult(BaseModel):
     """Model for consensus evaluation results"""
@@ -103,7 +160,7 @@ class ConsensusResult(BaseModel):
     agreement_points: List[str]
     disagreement_points: List[str]
     final_decision: Optional[str] = None
-    voting_results: Dict[str, Any] = {}
+    voting_results: Dict[str, Any] = Field(default_factory=dict)
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     
     # ADK-specific consensus fields
@@ -112,68 +169,154 @@ class ConsensusResult(BaseModel):
 
 class DebateSession(BaseModel):
     """Model for a debate session with ADK orchestrator support"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     scenario: str
     agents: List[Agent]
-    status: DebateStatus = DebateStatus.CREATED
+    status: DebateStatusLiteral = DebateStatus.CREATED.value
     current_round: int = 0
     max_rounds: int = 10
     consensus_reached: bool = False
     consensus_result: Optional[ConsensusResult] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-    messages: List[DebateMessage] = []
-    metadata: Dict[str, Any] = {}
+    messages: List[DebateMessage] = Field(default_factory=list)  # Recent window only; the log lives in Redis under debate_messages:{id}
+    metadata: Dict[str, Any] = Field(default_factory=dict)
     
     # ADK-specific fields
     orchestrator_id: Optional[str] = None  # ADK orchestrator instance ID
     adk_session_config: Dict[str, Any] = Field(default_factory=dict)  # ADK session configuration
     a2a_message_history: List[A2AMessage] = Field(default_factory=list)  # Full A2A message log
     
-    class Config:
-        use_enum_values = True
+    # Encoded agents list, built on first use (agents are fixed once the session exists)
+    _agents_json: Optional[bytes] = PrivateAttr(default=None)
+    # session_update event with the session id already encoded; only the live fields are formatted in
+    _update_template: Optional[str] = PrivateAttr(default=None)
+    # Length of the full message log as this process has seen it, including messages still being persisted
+    _message_count: int = PrivateAttr(default=0)
+    
+    model_config = ConfigDict(use_enum_values=True)
+    
+    @property
+    def message_count(self) -> int:
+        """Messages in the full log; the in-memory window holds the last len(messages) of them"""
+        return max(self._message_count, len(self.messages))
+    
+    @message_count.setter
+    def message_count(self, value: int):
+        self._message_count = value
+    
+    def add_messages(self, messages: List["DebateMessage"], history_limit: int):
+        """Append messages to the log, keeping only the most recent history_limit in memory"""
+        self._message_count = self.message_count + len(messages)
+        self.messages.extend(messages)
+        overflow = len(self.messages) - history_limit
+        if overflow > 0:
+            del self.messages[:overflow]
+    
+    def agents_json(self) -> bytes:
+        """Get the JSON-encoded agents list, serializing it only once per session"""
+        if self._agents_json is None:
+            self._agents_json = AGENT_LIST_ADAPTER.dump_json(self.agents)
+        return self._agents_json
+    
+    def session_update_json(self, orchestrator_active: bool = False) -> str:
+        """Encode the session_update WebSocket event from a per-session template"""
+        if self._update_template is None:
+            session_id = orjson.dumps(self.id).decode().replace("%", "%%")
+            self._update_template = (
+                '{"type":"session_update","session_id":' + session_id +
+                ',"status":%s,"current_round":%d,"consensus_reached":%s,"adk_orchestrator":"%s"}'
+            )
+        # TODO: Add ADK-specific events (agent actions, A2A messages, etc.)
+        return self._update_template % (
+            orjson.dumps(self.status).decode(),
+            self.current_round,
+            "true" if self.consensus_reached else "false",
+            "active" if orchestrator_active else "inactive"
+        )
+
+def _round_message_tag(value: Any) -> str:
+    """Tell debate and A2A messages apart; their message_type values overlap ("response")"""
+    if isinstance(value, dict):
+        return "a2a" if "sender" in value else "debate"
+    return "a2a" if isinstance(value, A2AMessage) else "debate"
+
+# Either kind of message in a round, dispatched on a tag instead of trying each model in turn
+RoundMessage = Annotated[
+    Union[Annotated[DebateMessage, Tag("debate")], Annotated[A2AMessage, Tag("a2a")]],
+    Discriminator(_round_message_tag)
+]
 
 class DebateRound(BaseModel):
-    """Model for a single debate round with A2A message tracking"""
+    """Model for a single debate round; A2A traffic shares the messages list"""
     round_number: int
     session_id: str
-    messages: List[DebateMessage]
+    messages: List[RoundMessage]
     start_time: datetime
     end_time: Optional[datetime] = None
     consensus_evaluated: bool = False
     consensus_result: Optional[ConsensusResult] = None
     
     # A2A protocol tracking
-    a2a_messages: List[A2AMessage] = Field(default_factory=list)  # A2A messages in this round
     agent_interactions: Dict[str, List[str]] = Field(default_factory=dict)  # Agent-to-agent interactions
 
 class AgentMemory(BaseModel):
     """Model for agent's memory and context with ADK integration"""
     agent_id: str
     session_id: str
-    past_proposals: List[str] = []
-    past_reasoning: List[str] = []
+    past_proposals: List[str] = Field(default_factory=list)
+    past_reasoning: List[str] = Field(default_factory=list)
     current_stance: str
-    goals_achieved: List[str] = []
-    constraints_violated: List[str] = []
-    interaction_history: List[Dict[str, Any]] = []
+    goals_achieved: List[str] = Field(default_factory=list)
+    constraints_violated: List[str] = Field(default_factory=list)
+    interaction_history: List[Dict[str, Any]] = Field(default_factory=list)
     last_updated: datetime = Field(default_factory=datetime.utcnow)
     
     # ADK-specific memory fields
     adk_context: Dict[str, Any] = Field(default_factory=dict)  # ADK agent context
     tool_usage_history: List[Dict[str, Any]] = Field(default_factory=list)  # Tool calls made
     a2a_interaction_log: List[A2AMessage] = Field(default_factory=list)  # A2A messages sent/received
+    
+    def retrieve(self, query: str, k: int = 5, recency_decay: float = 0.9) -> List[str]:
+        """
+        Return the k remembered items most worth putting in front of the agent for a query.
+        Items are past reasoning, proposals and interactions, scored as
+        0.8 * BM25 relevance + 0.1 * recency + 0.1 * importance (after Park et al.).
+        Recency decays by `recency_decay` per newer item of the same kind; interactions may
+        carry an "importance" in 0..1, everything else counts as 0.5.
+        """
+        items = []  # (text, recency, importance)
+        for entries in (self.past_reasoning, self.past_proposals):
+            items.extend(
+                (text, recency_decay ** (len(entries) - 1 - i), 0.5)
+                for i, text in enumerate(entries)
+            )
+        for i, entry in enumerate(self.interaction_history):
+            items.append((
+                str(entry.get("interaction", "")),
+                recency_decay ** (len(self.interaction_history) - 1 - i),
+                float(entry.get("importance", 0.5))
+            ))
+        if not items:
+            return []
+        
+        relevance = bm25_scores(query, [text for text, _, _ in items])
+        scored = [
+            (0.8 * rel + 0.1 * recency + 0.1 * importance, text)
+            for rel, (text, recency, importance) in zip(relevance, items)
+        ]
+        return [text for _, text in heapq.nlargest(k, scored, key=lambda pair: pair[0])]
 
 class DebateContext(BaseModel):
     """Model for debate context and shared information with ADK orchestrator state"""
     session_id: str
     scenario: str
-    debate_history: List[DebateMessage] = []
+    debate_history: List[DebateMessage] = Field(default_factory=list)
     current_round: int
-    agent_memories: Dict[str, AgentMemory] = {}
-    shared_context: Dict[str, Any] = {}
-    constraints: List[str] = []
-    objectives: List[str] = []
+    agent_memories: Dict[str, AgentMemory] = Field(default_factory=dict)
+    shared_context: Dict[str, Any] = Field(default_factory=dict)
+    constraints: List[str] = Field(default_factory=list)
+    objectives: List[str] = Field(default_factory=list)
     last_updated: datetime = Field(default_factory=datetime.utcnow)
     
     # ADK orchestrator state
@@ -182,6 +325,7 @@ class DebateContext(BaseModel):
     active_agent_states: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
 
 # Request/Response models for API endpoints
+# Responses are only built on the way out, so their validators/serializers are built on first use
 
 class StartSessionRequest(BaseModel):
     """Request model for starting a debate session"""
@@ -204,13 +348,15 @@ class StartSessionResponse(BaseModel):
     # ADK-specific response fields
     adk_orchestrator: str = "initialized"
     agent_registry: List[str] = Field(default_factory=list)  # ADK agent IDs
+    
+    model_config = ConfigDict(defer_build=True)
 
 class SessionStatusResponse(BaseModel):
     """Response model for session status"""
     session_id: str
     scenario: str
     agents: List[Agent]
-    status: DebateStatus
+    status: DebateStatusLiteral
     current_round: int
     consensus_reached: bool
     messages_count: int
@@ -220,6 +366,8 @@ class SessionStatusResponse(BaseModel):
     adk_orchestrator: str
     active_agents: List[str] = Field(default_factory=list)
     a2a_message_count: int = 0
+    
+    model_config = ConfigDict(use_enum_values=True, defer_build=True)
 
 class DebateMessageResponse(BaseModel):
     """Response model for debate messages"""
@@ -230,6 +378,8 @@ class DebateMessageResponse(BaseModel):
     # A2A protocol information
     a2a_correlation: Optional[str] = None
     agent_interactions: List[str] = Field(default_factory=list)
+    
+    model_config = ConfigDict(defer_build=True)
 
 class ConsensusResponse(BaseModel):
     """Response model for consensus evaluation"""
@@ -243,4 +393,21 @@ class ConsensusResponse(BaseModel):
     # ADK consensus details
     consensus_method: str
     agent_votes: Dict[str, Any]
-    orchestrator_recommendation: Optional[str] = None 
\ No newline at end of file
+    orchestrator_recommendation: Optional[str] = None
+    
+    model_config = ConfigDict(defer_build=True)
+
+# Batch (de)serializers for model lists; the per-item loop runs inside pydantic-core
+AGENT_LIST_ADAPTER = TypeAdapter(List[Agent])
+DEBATE_MESSAGE_LIST_ADAPTER = TypeAdapter(List[DebateMessage])
+A2A_MESSAGE_LIST_ADAPTER = TypeAdapter(List[A2AMessage])
+
+# Persona fields worth reusing across sessions; ids and LLM assignments are per session
+AGENT_TEMPLATE_FIELDS = {
+    "name", "role", "personality", "goals", "constraints", "expertise",
+    "initial_stance", "reasoning_style", "communication_style"
+}
+
+def agent_template_json(agents: List[Agent]) -> bytes:
+    """Serialize an agent lineup as a reusable template; validating it back yields agents with fresh ids"""
+    return AGENT_LIST_ADAPTER.dump_json(agents, include={"__all__": AGENT_TEMPLATE_FIELDS})
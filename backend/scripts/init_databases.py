@@ -6,7 +6,6 @@ Sets up Redis and ChromaDB databases with proper configuration
 
 import asyncio
 import sys
-import os
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -15,17 +14,16 @@ sys.path.append(str(Path(__file__).parent.parent))
 from services.memory_service import MemoryService
 from utils.config import get_settings
 
-async def check_redis_connectivity():
+async def check_redis_connectivity(settings):
     """Check if Redis is running and accessible"""
     print("🔍 Checking Redis connectivity...")
     
     try:
         import redis.asyncio as redis
-        settings = get_settings()
         
         client = redis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True)
         await client.ping()
-        await client.close()
+        await client.aclose()
         
         print("✅ Redis is running and accessible")
         return True
@@ -38,16 +36,11 @@ async def check_redis_connectivity():
         print("   3. Or manually: redis-server")
         return False
 
-async def setup_memory_service():
+async def setup_memory_service(memory_service: MemoryService):
     """Initialize memory service and create collections"""
     print("\n🗄️  Setting up Memory Service...")
     
     try:
-        # Set environment variable for ChromaDB
-        os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
-        
-        memory_service = MemoryService()
-        
         print("   Initializing connections...")
         await memory_service.initialize()
         
@@ -65,19 +58,16 @@ async def setup_memory_service():
             print("❌ Memory service initialization failed")
             return False
         
-        await memory_service.cleanup()
         return True
         
     except Exception as e:
         print(f"❌ Memory service setup failed: {e}")
         return False
 
-def check_environment_variables():
+def check_environment_variables(settings):
     """Check that required environment variables are set"""
     print("\n🔧 Checking Environment Variables...")
     
-    settings = get_settings()
-    
     # Check LLM API keys
     providers = []
     if settings.openai_api_key:
@@ -102,23 +92,22 @@ def check_environment_variables():
     
     return len(providers) > 0
 
-async def test_basic_operations():
-    """Test basic database operations"""
+async def test_basic_operations(memory_service: MemoryService):
+    """Test basic database operations on the already initialized memory service"""
     print("\n🧪 Testing Basic Database Operations...")
     
     try:
-        os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
-        
-        memory_service = MemoryService()
-        await memory_service.initialize()
-        
         # Test Redis operations
         print("   Testing Redis key-value operations...")
         test_key = "test:init:redis"
         test_value = "Database initialization test"
         
-        await memory_service.redis_client.set(test_key, test_value, ex=60)  # Expire in 60 seconds
-        retrieved = await memory_service.redis_client.get(test_key)
+        # Write, read back and clean up in a single round trip
+        async with memory_service.redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(test_key, test_value, ex=60)  # Expire in 60 seconds
+            pipe.get(test_key)
+            pipe.delete(test_key)
+            _, retrieved, _ = await pipe.execute()
         
         if retrieved == test_value:
             print("   ✅ Redis read/write operations working")
@@ -126,16 +115,12 @@ async def test_basic_operations():
             print("   ❌ Redis read/write operations failed")
             return False
         
-        # Clean up test key
-        await memory_service.redis_client.delete(test_key)
-        
         # Test ChromaDB operations
         print("   Testing ChromaDB collection operations...")
         
         # This was already tested during memory service initialization
         print("   ✅ ChromaDB collections accessible")
         
-        await memory_service.cleanup()
         print("✅ All basic operations working")
         return True
         
@@ -148,29 +133,36 @@ async def main():
     print("🚀 Multi-Agent Negotiation Framework - Database Initialization")
     print("=" * 70)
     
+    settings = get_settings()
+    
     # Step 1: Check environment variables
-    env_ok = check_environment_variables()
+    env_ok = check_environment_variables(settings)
     
     # Step 2: Check Redis connectivity
-    redis_ok = await check_redis_connectivity()
+    redis_ok = await check_redis_connectivity(settings)
     
     if not redis_ok:
         print("\n❌ Cannot proceed without Redis. Please install and start Redis first.")
         return 1
     
-    # Step 3: Setup memory service
-    memory_ok = await setup_memory_service()
-    
-    if not memory_ok:
-        print("\n❌ Memory service setup failed.")
-        return 1
-    
-    # Step 4: Test basic operations
-    operations_ok = await test_basic_operations()
-    
-    if not operations_ok:
-        print("\n❌ Basic operations test failed.")
-        return 1
+    # Steps 3 and 4 share one memory service and its connections
+    memory_service = MemoryService()
+    try:
+        # Step 3: Setup memory service
+        memory_ok = await setup_memory_service(memory_service)
+        
+        if not memory_ok:
+            print("\n❌ Memory service setup failed.")
+            return 1
+        
+        # Step 4: Test basic operations
+        operations_ok = await test_basic_operations(memory_service)
+        
+        if not operations_ok:
+            print("\n❌ Basic operations test failed.")
+            return 1
+    finally:
+        await memory_service.cleanup()
     
     # Summary
     print("\n" + "=" * 70)
@@ -5,8 +5,9 @@ Validates all components: databases, LLM providers, services, and integration
 """
 
 import asyncio
+import io
 import sys
-import os
+from contextvars import ContextVar
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -19,13 +20,43 @@ from services.debate_service import DebateService
 from utils.config import get_settings
 from models.debate import Agent
 
-async def validate_environment():
+# Output buffer of the check running in the current task, if any
+_check_output: ContextVar = ContextVar("check_output", default=None)
+
+class _CheckStdout:
+    """Routes print() from a concurrently running check into that check's own buffer"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def write(self, text):
+        buffer = _check_output.get()
+        return (buffer or self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+
+async def run_check(test_name, test_func):
+    """Run one check with its output buffered; returns (passed, output)"""
+    buffer = io.StringIO()
+    token = _check_output.set(buffer)
+    
+    try:
+        result = bool(await test_func())
+        print(f"{'✅' if result else '❌'} {test_name}: {'PASSED' if result else 'FAILED'}")
+    except Exception as e:
+        print(f"❌ {test_name}: ERROR - {e}")
+        result = False
+    finally:
+        _check_output.reset(token)
+    
+    return result, buffer.getvalue()
+
+async def validate_environment(settings):
     """Validate environment configuration"""
     print("🔧 Validating Environment Configuration...")
     
     try:
-        settings = get_settings()
-        
         issues = []
         
         # Check basic settings
@@ -56,14 +87,11 @@ async def validate_environment():
         print(f"❌ Environment validation error: {e}")
         return False
 
-async def validate_databases():
+async def validate_databases(memory_service: MemoryService):
     """Validate database connectivity and operations"""
     print("\n💾 Validating Database Systems...")
     
     try:
-        os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
-        
-        memory_service = MemoryService()
         await memory_service.initialize()
         
         # Test Redis
@@ -80,16 +108,16 @@ async def validate_databases():
         
         # Test basic operations
         test_key = "validation:test"
-        await memory_service.redis_client.set(test_key, "test_value", ex=10)
-        retrieved = await memory_service.redis_client.get(test_key)
+        async with memory_service.redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(test_key, "test_value", ex=10)
+            pipe.get(test_key)
+            pipe.delete(test_key)
+            _, retrieved, _ = await pipe.execute()
         
         if retrieved != "test_value":
             print("❌ Redis operations failed")
             return False
         
-        await memory_service.redis_client.delete(test_key)
-        await memory_service.cleanup()
-        
         print("✅ Database systems validated")
         print("   - Redis: Connected and operational")
         print("   - ChromaDB: Connected and operational")
@@ -114,18 +142,23 @@ async def validate_llm_providers():
         working_providers = []
         test_prompt = "Respond with just 'OK' to confirm you're working."
         
-        for provider in providers:
-            try:
-                response = await llm_service.generate_response(
-                    prompt=test_prompt,
-                    provider=provider,
-                    max_tokens=10,
-                    temperature=0.1
-                )
+        # Probe every provider at once; each call is a full network round trip
+        responses = await asyncio.gather(*[
+            llm_service.generate_response(
+                prompt=test_prompt,
+                provider=provider,
+                max_tokens=10,
+                temperature=0.1
+            )
+            for provider in providers
+        ], return_exceptions=True)
+        
+        for provider, response in zip(providers, responses):
+            if isinstance(response, Exception):
+                print(f"   ❌ {provider.upper()}: {str(response)[:50]}...")
+            else:
                 print(f"   ✅ {provider.upper()}: {response.content[:20]}...")
                 working_providers.append(provider)
-            except Exception as e:
-                print(f"   ❌ {provider.upper()}: {str(e)[:50]}...")
         
         if not working_providers:
             print("❌ No LLM providers are working")
@@ -138,16 +171,11 @@ async def validate_llm_providers():
         print(f"❌ LLM provider validation error: {e}")
         return False
 
-async def validate_agent_service():
+async def validate_agent_service(memory_service: MemoryService):
     """Validate agent generation service"""
     print("\n👥 Validating Agent Service...")
     
     try:
-        os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
-        
-        memory_service = MemoryService()
-        await memory_service.initialize()
-        
         agent_service = AgentService(memory_service)
         
         # Test agent generation
@@ -168,7 +196,6 @@ async def validate_agent_service():
                 print(f"❌ Agent {i} missing LLM provider assignment")
                 return False
         
-        await memory_service.cleanup()
         
         print("✅ Agent service validated")
         print(f"   - Generated {len(agents)} agents")
@@ -181,16 +208,11 @@ async def validate_agent_service():
         print(f"❌ Agent service validation error: {e}")
         return False
 
-async def validate_debate_service():
+async def validate_debate_service(memory_service: MemoryService):
     """Validate debate service functionality"""
     print("\n🗣️  Validating Debate Service...")
     
     try:
-        os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
-        
-        memory_service = MemoryService()
-        await memory_service.initialize()
-        
         # Create test agents
         test_agents = [
             Agent(
@@ -235,7 +257,6 @@ async def validate_debate_service():
         
         # Cleanup
         await memory_service.clear_session_data(session_id)
-        await memory_service.cleanup()
         
         print("✅ Debate service validated")
         print(f"   - Session created: {session_id}")
@@ -272,33 +293,59 @@ async def main():
     print("🧪 Multi-Agent Negotiation Framework - Complete System Validation")
     print("=" * 80)
     
-    tests = [
-        ("Environment Configuration", validate_environment),
-        ("Database Systems", validate_databases),
-        ("LLM Providers", validate_llm_providers),
-        ("Agent Service", validate_agent_service),
-        ("Debate Service", validate_debate_service),
-        ("System Integration", validate_integration),
+    settings = get_settings()
+    # One memory service for every step; validate_databases initializes it
+    memory_service = MemoryService()
+    
+    # The service checks use the memory service that the database check initializes
+    database_tests = [
+        ("Agent Service", lambda: validate_agent_service(memory_service)),
+        ("Debate Service", lambda: validate_debate_service(memory_service)),
     ]
     
     results = []
     
-    for test_name, test_func in tests:
+    def report(test_name, output):
         print(f"\n🧪 Running: {test_name}")
         print("-" * 60)
-        
-        try:
-            result = await test_func()
+        print(output, end="")
+    
+    stdout = sys.stdout
+    sys.stdout = _CheckStdout(stdout)
+    try:
+        # Environment, databases and LLM providers are independent, so they run concurrently; each
+        # check's output is buffered and printed afterwards in a fixed order so the report stays readable
+        environment, databases, llm_providers = await asyncio.gather(
+            run_check("Environment Configuration", lambda: validate_environment(settings)),
+            run_check("Database Systems", lambda: validate_databases(memory_service)),
+            run_check("LLM Providers", validate_llm_providers),
+        )
+        databases_ok = databases[0]
+        
+        for test_name, (result, output) in [
+            ("Environment Configuration", environment),
+            ("Database Systems", databases),
+            ("LLM Providers", llm_providers),
+        ]:
+            report(test_name, output)
             results.append((test_name, result))
+        
+        for test_name, test_func in database_tests:
+            if not databases_ok:
+                report(test_name, f"⏭️  {test_name}: SKIPPED - database systems are not available\n")
+                results.append((test_name, False))
+                continue
             
-            if result:
-                print(f"✅ {test_name}: PASSED")
-            else:
-                print(f"❌ {test_name}: FAILED")
-                
-        except Exception as e:
-            print(f"❌ {test_name}: ERROR - {e}")
-            results.append((test_name, False))
+            result, output = await run_check(test_name, test_func)
+            report(test_name, output)
+            results.append((test_name, result))
+        
+        result, output = await run_check("System Integration", validate_integration)
+        report("System Integration", output)
+        results.append(("System Integration", result))
+    finally:
+        sys.stdout = stdout
+        await memory_service.cleanup()
     
     # Summary
     print("\n" + "=" * 80)
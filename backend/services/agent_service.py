@@ -1,34 +1,368 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Callable, Mapping
+from collections import OrderedDict
+from types import MappingProxyType
+from functools import cached_property, lru_cache
+import asyncio
+import random
+import re
+import time
+import orjson
 from loguru import logger
-from models.debate import Agent
+from models.debate import Agent, AGENT_LIST_ADAPTER, AGENT_TEMPLATE_FIELDS, agent_template_json
 from utils.config import get_settings
 from services.mcp_tools import MCPToolRegistry
 from services.llm_service import MultiLLMService
 
 # ADK imports
 from google.adk.agents import Agent as ADKAgent, LlmAgent
-from google.adk.models import Gemini
+from google.adk.models import Gemini, LlmRequest
+from google.genai import types
+
+# Markdown code fences (with or without a language tag) around an LLM's JSON output
+_CODE_FENCE_RE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+# Characters ADK does not accept in agent names
+_NAME_UNSAFE_RE = re.compile(r"[^a-zA-Z0-9_]")
+
+# Static part of the agent generation prompt. It never changes between calls, so it leads
+# the prompt and is built once at import instead of per call.
+_AGENT_GENERATION_PROMPT_PREFIX = """You are an expert in stakeholder analysis and debate facilitation. Analyze the scenario given at the end of this prompt and dynamically generate diverse debate agents who would be most relevant to this specific topic.
+
+**Your Task:**
+1. First, identify the key stakeholder groups who would be most affected by or interested in this scenario
+2. Consider what types of expertise, perspectives, and interests would be most relevant
+3. Think about potential conflicts of interest and different viewpoints that would emerge
+4. Generate agents that represent the most important and diverse perspectives for THIS specific scenario
+
+**Requirements:**
+- Each agent must be highly relevant to the specific scenario provided
+- Agents should have realistic professional backgrounds that relate to the topic
+- Include both supporters and skeptics/opponents where appropriate
+- Ensure diverse expertise areas that would naturally contribute to this debate
+- Create agents with specific, actionable goals related to the scenario
+- Give each agent realistic constraints based on their role and responsibilities
+- Avoid generic roles - be specific to the domain and context
+
+**Guidelines for Agent Creation:**
+- Names should reflect realistic professional identities
+- Roles should be specific job titles or positions relevant to the scenario
+- Personalities should influence how they would approach this particular issue
+- Goals should be concrete and related to what someone in their position would actually want
+- Constraints should reflect real-world limitations they would face
+- Expertise should be directly applicable to the scenario
+- Initial stance should be nuanced and realistic for their background
+- Communication style should match their professional context
+
+**Output Format:** Return ONLY a JSON object with this exact structure:
+{
+  "agents": [
+    {
+      "name": "Agent Name",
+      "role": "Specific role title",
+      "personality": "Personality description",
+      "goals": ["goal1", "goal2", "goal3"],
+      "constraints": ["constraint1", "constraint2"],
+      "expertise": ["area1", "area2", "area3"],
+      "initial_stance": "Initial position on the scenario",
+      "reasoning_style": "How they approach problems",
+      "communication_style": "How they communicate"
+    }
+  ]
+}
+
+Focus on creating agents that will produce rich, meaningful debates with different perspectives.
+"""
+
+_AGENT_GENERATION_PROMPT_SUFFIX = """
+**Available LLM Providers:** {providers}
+
+**Scenario:** {scenario}
+
+Generate {agent_count} agents for this scenario."""
+
+def _freeze(value: Any) -> Any:
+    """Read-only view of a nested JSON-like constant: dicts become MappingProxyType, lists become tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+# Parameter schemas for the MCP tools exposed to ADK agents; frozen so they can be shared by reference
+_TOOL_PARAMETER_SCHEMAS = _freeze({
+    "redis_memory": {
+        "type": "object",
+        "properties": {
+            "operation": {
+                "type": "string",
+                "enum": ["get_agent_memory", "store_agent_memory", "get_session", "get_recent_messages"],
+                "description": "Redis operation to perform"
+            },
+            "session_id": {"type": "string", "description": "Session ID"},
+            "agent_id": {"type": "string", "description": "Agent ID"},
+            "memory_data": {"type": "object", "description": "Memory data to store"},
+            "limit": {"type": "integer", "description": "Limit for results", "default": 10}
+        },
+        "required": ["operation"]
+    },
+    "chromadb_search": {
+        "type": "object",
+        "properties": {
+            "operation": {
+                "type": "string",
+                "enum": ["search_session_history", "search_agent_memories", "search_a2a_messages"],
+                "description": "ChromaDB operation to perform"
+            },
+            "query": {"type": "string", "description": "Search query"},
+            "session_id": {"type": "string", "description": "Session ID (optional)"},
+            "limit": {"type": "integer", "description": "Limit for results", "default": 10}
+        },
+        "required": ["operation", "query"]
+    },
+    "agent_memory": {
+        "type": "object",
+        "properties": {
+            "operation": {
+                "type": "string",
+                "enum": ["update_stance", "add_reasoning", "add_proposal", "track_interaction", "retrieve"],
+                "description": "Memory operation to perform"
+            },
+            "session_id": {"type": "string", "description": "Session ID"},
+            "agent_id": {"type": "string", "description": "Agent ID"},
+            "stance": {"type": "string", "description": "New stance"},
+            "reasoning": {"type": "string", "description": "Reasoning to add"},
+            "proposal": {"type": "string", "description": "Proposal to add"},
+            "interaction": {"type": "object", "description": "Interaction to track"},
+            "query": {"type": "string", "description": "What to recall (retrieve)"},
+            "limit": {"type": "integer", "description": "Maximum memories to return (retrieve)"}
+        },
+        "required": ["operation", "session_id", "agent_id"]
+    },
+    "debate_history": {
+        "type": "object",
+        "properties": {
+            "operation": {
+                "type": "string",
+                "enum": ["get_debate_context", "get_agent_interactions", "get_round_summary"],
+                "description": "History operation to perform"
+            },
+            "session_id": {"type": "string", "description": "Session ID"},
+            "target_agent_id": {"type": "string", "description": "Target agent ID"},
+            "round_number": {"type": "integer", "description": "Round number"}
+        },
+        "required": ["operation", "session_id"]
+    }
+})
+
+_EMPTY_TOOL_PARAMETERS = _freeze({
+    "type": "object",
+    "properties": {},
+    "required": []
+})
+
+# Persona fields read from LLM-generated agent definitions, with the value used when one is missing
+_GENERATED_AGENT_DEFAULTS = {
+    "name": "Unknown Agent",
+    "role": "General Participant",
+    "personality": "Balanced and thoughtful",
+    "goals": ("Participate in debate",),
+    "constraints": ("Be respectful",),
+    "expertise": ("General knowledge",),
+    "initial_stance": "Open to discussion",
+    "reasoning_style": "Logical",
+    "communication_style": "Clear and direct",
+}
+
+# Persona fields that depend on the exact motion; a lineup reused for a similar scenario has these rewritten
+_SCENARIO_SPECIFIC_FIELDS = ("name", "initial_stance", "goals", "constraints")
+
+_AGENT_ADAPTATION_SYSTEM_PROMPT = """You adapt existing debate agent lineups to a closely related scenario.
+Keep each agent's role, expertise and perspective; rewrite only what depends on the exact motion.
+Always respond with valid JSON only."""
+
+_AGENT_ADAPTATION_PROMPT = """These agents were created for a similar scenario:
+{agents}
+
+**Scenario:** {scenario}
+
+For each agent, in the same order, rewrite its name, initial_stance, goals and constraints so they fit this scenario exactly. Note that the scenario may argue the opposite motion from the one the agents were created for.
+Return {{"agents": [{{"name": "...", "initial_stance": "...", "goals": ["..."], "constraints": ["..."]}}]}} with exactly {agent_count} entries."""
+
+# Generic lineup used when no LLM provider can generate agents
+_FALLBACK_AGENT_DEFINITIONS = (
+    {
+        "name": "Analyst",
+        "role": "Data Analyst",
+        "personality": "Analytical and detail-oriented",
+        "goals": ["Provide data-driven insights"],
+        "constraints": ["Must base arguments on evidence"],
+        "expertise": ["Data analysis", "Statistics"],
+        "initial_stance": "Neutral, seeking evidence",
+        "reasoning_style": "Logical and systematic",
+        "communication_style": "Precise and factual"
+    },
+    {
+        "name": "Advocate",
+        "role": "User Advocate",
+        "personality": "Empathetic and passionate",
+        "goals": ["Represent user interests"],
+        "constraints": ["Must consider user impact"],
+        "expertise": ["User experience", "Human factors"],
+        "initial_stance": "Pro-user benefits",
+        "reasoning_style": "Empathetic and holistic",
+        "communication_style": "Persuasive and emotional"
+    },
+    {
+        "name": "Pragmatist",
+        "role": "Implementation Specialist",
+        "personality": "Practical and realistic",
+        "goals": ["Ensure feasible solutions"],
+        "constraints": ["Must consider practical limitations"],
+        "expertise": ["Implementation", "Resource management"],
+        "initial_stance": "Focused on feasibility",
+        "reasoning_style": "Practical and solution-oriented",
+        "communication_style": "Direct and pragmatic"
+    },
+    {
+        "name": "Innovator",
+        "role": "Innovation Lead",
+        "personality": "Creative and forward-thinking",
+        "goals": ["Drive innovation and new ideas"],
+        "constraints": ["Must consider long-term impact"],
+        "expertise": ["Innovation", "Technology trends"],
+        "initial_stance": "Focused on future opportunities",
+        "reasoning_style": "Creative and visionary",
+        "communication_style": "Inspiring and enthusiastic"
+    },
+    {
+        "name": "Strategist",
+        "role": "Business Strategist",
+        "personality": "Strategic and analytical",
+        "goals": ["Optimize business outcomes"],
+        "constraints": ["Must consider market dynamics"],
+        "expertise": ["Strategy", "Market analysis"],
+        "initial_stance": "Focused on competitive advantage",
+        "reasoning_style": "Strategic and comprehensive",
+        "communication_style": "Authoritative and clear"
+    },
+    {
+        "name": "Guardian",
+        "role": "Risk Manager",
+        "personality": "Cautious and thorough",
+        "goals": ["Minimize risks and protect interests"],
+        "constraints": ["Must consider potential downsides"],
+        "expertise": ["Risk assessment", "Compliance"],
+        "initial_stance": "Risk-averse and protective",
+        "reasoning_style": "Careful and methodical",
+        "communication_style": "Cautious and detailed"
+    },
+)
+
+# ADK agent instructions, filled in per agent by _agent_instruction
+_AGENT_INSTRUCTION_TEMPLATE = """You are {name}, participating in a multi-agent negotiation debate.
+
+Your Role: {role}
+Your Personality: {personality}
+Your Goals: {goals}
+Your Constraints: {constraints}
+Your Expertise: {expertise}
+Your Initial Stance: {initial_stance}
+Your Reasoning Style: {reasoning_style}
+Your Communication Style: {communication_style}
+
+Available Tools: {available_tools}
+
+In this debate, you should:
+1. Stay true to your role and personality
+2. Pursue your goals while respecting your constraints
+3. Use your expertise to make informed arguments
+4. Communicate in your characteristic style
+5. Be open to changing your position if presented with compelling arguments
+6. Work towards consensus while maintaining your core principles
+7. Use your available tools to:
+   - Access your memory and update your stance (agent_memory)
+   - Search for relevant information from debate history (chromadb_search)
+   - Get context about the current debate state (redis_memory)
+   - Review past interactions and rounds (debate_history)
+
+Tool Usage Guidelines:
+- Use agent_memory to track your evolving stance and reasoning
+- Use chromadb_search to find relevant precedents or similar arguments
+- Use redis_memory to get recent messages and session context
+- Use debate_history to understand interaction patterns with other agents
+
+Always respond as {name} would, considering your unique perspective and motivations.
+Make strategic use of your tools to enhance your reasoning and arguments."""
+
+@lru_cache(maxsize=8)
+def _gemini_model(model_name: str, api_key: Optional[str], temperature: float, max_tokens: int) -> Gemini:
+    """One ADK Gemini client per configuration, shared by every session's AgentService"""
+    return Gemini(
+        model_name=model_name,
+        api_key=api_key,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+
+@lru_cache(maxsize=1024)
+def _agent_instruction(
+    name: str,
+    role: str,
+    personality: str,
+    goals: Tuple[str, ...],
+    constraints: Tuple[str, ...],
+    expertise: Tuple[str, ...],
+    initial_stance: str,
+    reasoning_style: str,
+    communication_style: str,
+    mcp_tools: Tuple[str, ...],
+) -> str:
+    """ADK instruction text for an agent, memoized on its persona fields"""
+    # Get available tools for instruction
+    available_tools = ", ".join(mcp_tools) if mcp_tools else "None"
+    return _AGENT_INSTRUCTION_TEMPLATE.format(
+        name=name,
+        role=role,
+        personality=personality,
+        goals=', '.join(goals),
+        constraints=', '.join(constraints),
+        expertise=', '.join(expertise),
+        initial_stance=initial_stance,
+        reasoning_style=reasoning_style,
+        communication_style=communication_style,
+        available_tools=available_tools,
+    )
 
 class AgentService:
     def __init__(self, memory_service=None):
         self.settings = get_settings()
         # Multi-LLM service for agent generation and reasoning
         self.llm_service = MultiLLMService()
-        # LLM client setup for ADK (fallback)
-        self.model = self._setup_adk_model()
+        # Memory service backs the generated-agent cache (optional)
+        self.memory_service = memory_service
+        # Exact (scenario, agent_count) -> agent template JSON, LRU ordered
+        self.agent_templates: OrderedDict[Tuple[str, int], bytes] = OrderedDict()
+        # (scenario, agent_count) -> generation currently running for it
+        self.pending_generations: Dict[Tuple[str, int], asyncio.Future] = {}
+        # Circuit breaker per provider: consecutive failures and the monotonic time it stays skipped until
+        self.provider_breakers: Dict[str, Tuple[int, float]] = {}
         # MCP tools registry (will be injected)
         self.mcp_tools = MCPToolRegistry(memory_service) if memory_service else None
 
+    @cached_property
+    def model(self):
+        """LLM client for ADK (fallback), built on first use so custom-agent sessions never pay for it"""
+        return self._setup_adk_model()
+
     def _setup_adk_model(self):
         """
         Set up the ADK model for agent generation and reasoning.
         """
         try:
-            return Gemini(
-                model_name=self.settings.adk_model_name,
-                api_key=self.settings.google_api_key,
-                temperature=self.settings.adk_model_temperature,
-                max_tokens=self.settings.adk_model_max_tokens,
+            return _gemini_model(
+                self.settings.adk_model_name,
+                self.settings.google_api_key,
+                self.settings.adk_model_temperature,
+                self.settings.adk_model_max_tokens,
             )
         except Exception as e:
             logger.warning(f"Failed to initialize ADK model: {e}")
@@ -53,34 +387,31 @@ class AgentService:
                     agent.llm_provider = self.llm_service.select_llm_for_agent(scenario, agent)
             return custom_agents
 
-        # 1. Build a prompt for the orchestrator LLM to generate agent definitions
-        prompt = self._build_agent_generation_prompt(scenario, agent_count)
-        
-        # 2. Use the orchestrator LLM to generate agent definitions (try multiple providers)
-        available_providers = self.llm_service.get_available_providers()
-        providers_to_try = [self.settings.default_llm_provider] + [p for p in available_providers if p != self.settings.default_llm_provider]
-        
-        agents = None
-        for provider in providers_to_try:
-            if provider not in available_providers:
-                continue
-                
-            try:
-                logger.info(f"Attempting agent generation with provider: {provider}")
-                llm_response = await self.llm_service.generate_response(
-                    prompt=prompt,
-                    provider=provider,
-                    system_prompt=self._build_orchestrator_system_prompt()
-                )
+        cache_key = (scenario, agent_count)
+        template = self.agent_templates.get(cache_key) if self.settings.agent_cache_enabled else None
+        if template is not None:
+            # Exact repeats are served from this process without embedding the scenario
+            self.agent_templates.move_to_end(cache_key)
+            logger.info(f"Reusing locally cached agents for scenario: {scenario}")
+        else:
+            # Identical requests that arrive while one is being generated share its result
+            pending = self.pending_generations.get(cache_key)
+            if pending is None:
+                pending = asyncio.ensure_future(self._resolve_agent_template(scenario, agent_count))
+                self.pending_generations[cache_key] = pending
+                pending.add_done_callback(lambda _: self.pending_generations.pop(cache_key, None))
+            else:
+                logger.info(f"Joining in-flight agent generation for scenario: {scenario}")
+            # Shielded so one caller disconnecting does not cancel the others' generation
+            template, exact = await asyncio.shield(pending)
+            # Lineups adapted from a similar scenario are not promoted to the exact-match cache
+            if template is not None and exact and self.settings.agent_cache_enabled:
+                self.agent_templates[cache_key] = template
+                if len(self.agent_templates) > self.settings.agent_cache_size:
+                    self.agent_templates.popitem(last=False)
 
-                # 3. Parse the LLM output into Agent model instances
-                agents = self._parse_llm_response_to_agents(llm_response.content, agent_count)
-                logger.info(f"Successfully generated {len(agents)} agents using {provider}")
-                break  # Success, exit the retry loop
-                
-            except Exception as e:
-                logger.warning(f"Agent generation failed with {provider}: {e}")
-                continue  # Try next provider
+        # Every caller gets its own Agent objects with fresh ids
+        agents = AGENT_LIST_ADAPTER.validate_json(template) if template is not None else None
         
         # If all providers failed, use fallback agents
         if agents is None:
@@ -96,6 +427,169 @@ class AgentService:
         # 5. Return the list of agents with assigned LLM providers
         return agents
 
+    async def _resolve_agent_template(self, scenario: str, agent_count: int) -> Tuple[Optional[bytes], bool]:
+        """
+        Agent template JSON for a scenario from the agent caches, or else from the orchestrator LLM,
+        and whether it was made for exactly this scenario. Returns (None, False) if every provider fails.
+        """
+        use_cache = self.memory_service is not None and self.settings.agent_cache_enabled
+        if use_cache:
+            # Exact repeats from earlier runs or other workers
+            template = await self.memory_service.get_exact_agent_template(scenario, agent_count)
+            if template:
+                logger.info(f"Reusing stored agents for scenario: {scenario}")
+                return template.encode(), True
+            # Reworded versions of a recent scenario reuse its roles and expertise; similar wording can
+            # still mean the opposite motion, so the stance-bearing fields are rewritten by a small LLM call
+            agents = await self.memory_service.find_agent_template(
+                scenario, agent_count, self.settings.agent_cache_max_distance
+            )
+            if agents:
+                adapted = await self._adapt_agents_to_scenario(scenario, agents)
+                if adapted:
+                    logger.info(f"Adapted cached agents for scenario: {scenario}")
+                    return agent_template_json(adapted), False
+
+        agents = await self._generate_agents_with_llm(scenario, agent_count)
+        if not agents:
+            return None, False
+        template = agent_template_json(agents)
+        if use_cache:
+            await asyncio.gather(
+                self.memory_service.store_agent_template(scenario, agents),
+                self.memory_service.store_exact_agent_template(scenario, agent_count, template)
+            )
+        return template, True
+
+    async def _adapt_agents_to_scenario(self, scenario: str, agents: List[Agent]) -> Optional[List[Agent]]:
+        """
+        Rewrite the scenario-specific fields of a lineup cached for a similar scenario.
+        Returns None if no provider produces a usable adaptation.
+        """
+        prompt = _AGENT_ADAPTATION_PROMPT.format(
+            agents=AGENT_LIST_ADAPTER.dump_json(agents, include={"__all__": AGENT_TEMPLATE_FIELDS}).decode(),
+            scenario=scenario,
+            agent_count=len(agents),
+        )
+
+        def parse(content: str) -> List[Agent]:
+            data = orjson.loads(_CODE_FENCE_RE.sub("", content.strip()))
+            rewrites = data if isinstance(data, list) else data.get("agents", [])
+            if len(rewrites) != len(agents):
+                raise ValueError(f"Expected {len(agents)} adapted agents, got {len(rewrites)}")
+            definitions = []
+            for agent, rewrite in zip(agents, rewrites):
+                definition = agent.model_dump(include=AGENT_TEMPLATE_FIELDS)
+                definition.update({field: rewrite[field] for field in _SCENARIO_SPECIFIC_FIELDS if field in rewrite})
+                definition["name"] = self._sanitize_agent_name(definition["name"])
+                definitions.append(definition)
+            return AGENT_LIST_ADAPTER.validate_python(definitions)
+
+        return await self._hedged_generation(prompt, _AGENT_ADAPTATION_SYSTEM_PROMPT, parse, "agent adaptation")
+
+    async def _generate_agents_with_llm(self, scenario: str, agent_count: int) -> Optional[List[Agent]]:
+        """
+        Ask the orchestrator LLM for agent definitions. Returns None if every provider fails.
+        """
+        # 1. Build a prompt for the orchestrator LLM to generate agent definitions
+        prompt = self._build_agent_generation_prompt(scenario, agent_count)
+        
+        # 2. Use the orchestrator LLM to generate agent definitions (try multiple providers)
+        # 3. Parse the LLM output into Agent model instances
+        return await self._hedged_generation(
+            prompt,
+            self.orchestrator_system_prompt,
+            lambda content: self._parse_llm_response_to_agents(content, agent_count),
+            "agent generation"
+        )
+
+    async def _hedged_generation(
+        self,
+        prompt: str,
+        system_prompt: str,
+        parse: Callable[[str], List[Agent]],
+        purpose: str
+    ) -> Optional[List[Agent]]:
+        """
+        Run a JSON-mode agent call with hedged requests across the available providers.
+        The next provider starts when the previous one fails or has not answered within llm_hedge_delay;
+        the first successful parse wins and the rest are cancelled. Returns None if every provider fails.
+        """
+        now = time.monotonic()
+        remaining = [p for p in self.generation_providers if self.provider_breakers.get(p, (0, 0.0))[1] <= now]
+        if not remaining:
+            # Every breaker is open; probing beats going straight to fallback agents
+            remaining = list(self.generation_providers)
+
+        async def attempt(provider: str) -> List[Agent]:
+            logger.info(f"Attempting {purpose} with provider: {provider}")
+            llm_response = await self.llm_service.generate_response(
+                prompt=prompt,
+                provider=provider,
+                system_prompt=system_prompt,
+                json_output=True,
+                model=self.settings.get_agent_generation_model(provider)
+            )
+            agents = parse(llm_response.content)
+            logger.info(f"Successful {purpose} of {len(agents)} agents using {provider}")
+            return agents
+
+        in_flight: Dict[asyncio.Task, str] = {}
+        try:
+            while remaining or in_flight:
+                if remaining:
+                    provider = remaining.pop(0)
+                    in_flight[asyncio.create_task(attempt(provider))] = provider
+                # Wait for a result, or only the hedge delay while there is still a provider left to start
+                done, _ = await asyncio.wait(
+                    in_flight,
+                    timeout=self.settings.llm_hedge_delay if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    provider = in_flight.pop(task)
+                    if task.exception() is None:
+                        self.provider_breakers.pop(provider, None)
+                        return task.result()
+                    logger.warning(f"{purpose.capitalize()} failed with {provider}: {task.exception()}")
+                    self._record_provider_failure(provider)
+        finally:
+            for task in in_flight:
+                task.cancel()
+        
+        return None
+
+    def _record_provider_failure(self, provider: str):
+        """Count a failure and, past the threshold, skip the provider for an exponentially growing, jittered cooldown"""
+        failures = self.provider_breakers.get(provider, (0, 0.0))[0] + 1
+        open_until = 0.0
+        if failures >= self.settings.llm_breaker_threshold:
+            exponent = min(failures - self.settings.llm_breaker_threshold, 5)
+            cooldown = self.settings.llm_breaker_cooldown * 2 ** exponent * random.uniform(0.8, 1.2)
+            open_until = time.monotonic() + cooldown
+            logger.warning(f"Skipping {provider} for agent generation for {cooldown:.0f}s after {failures} failures")
+        self.provider_breakers[provider] = (failures, open_until)
+
+    async def warm_up(self):
+        """
+        Prepare for the first session in the background: build the shared ADK Gemini client.
+        """
+        await asyncio.to_thread(lambda: self.model)
+
+    async def generate_agents_bulk(self, scenarios: List[str], agent_count: int = 5) -> List[List[Agent]]:
+        """
+        Generate agents for several scenarios at once, one LLM call per scenario.
+        Calls overlap on the network, capped at llm_max_concurrent_requests to respect provider rate limits.
+        Results are in the same order as `scenarios`.
+        """
+        semaphore = asyncio.Semaphore(self.settings.llm_max_concurrent_requests)
+
+        async def generate(scenario: str) -> List[Agent]:
+            async with semaphore:
+                return await self.generate_agents(scenario, agent_count)
+
+        return await asyncio.gather(*[generate(scenario) for scenario in scenarios])
+
     async def create_adk_agent(self, agent: Agent) -> ADKAgent:
         """
         Convert our Agent model to an ADK agent instance with full configuration.
@@ -108,10 +602,12 @@ class AgentService:
             # Build comprehensive instructions for the ADK agent
             instruction = self._build_agent_instruction(agent)
             
-            # Create ADK LlmAgent with proper configuration
+            # Create ADK LlmAgent with proper configuration. Each session gets its own instance: ADK agents
+            # track their parent agent and can only be attached to one orchestrator, so they are not shared
             adk_agent = LlmAgent(
                 name=sanitized_name,
-                description=f"Role: {agent.role}. Personality: {agent.personality}",
+                # Role and personality are already in the instruction; the description only needs to identify the agent
+                description=agent.role,
                 model=self.model,
                 instruction=instruction,
             )
@@ -164,7 +660,7 @@ class AgentService:
             
             # Execute the MCP tool
             result = await mcp_tool.execute(**kwargs)
-            return result.dict()
+            return result.model_dump()
         
         # Return ADK-compatible tool structure
         return {
@@ -174,123 +670,39 @@ class AgentService:
             "parameters": self._get_tool_parameters(tool_name)
         }
     
-    def _get_tool_parameters(self, tool_name: str) -> Dict[str, Any]:
+    def _get_tool_parameters(self, tool_name: str) -> Mapping[str, Any]:
         """
         Get parameter schema for each tool type.
         """
-        parameter_schemas = {
-            "redis_memory": {
-                "type": "object",
-                "properties": {
-                    "operation": {
-                        "type": "string",
-                        "enum": ["get_agent_memory", "store_agent_memory", "get_session", "get_recent_messages"],
-                        "description": "Redis operation to perform"
-                    },
-                    "session_id": {"type": "string", "description": "Session ID"},
-                    "agent_id": {"type": "string", "description": "Agent ID"},
-                    "memory_data": {"type": "object", "description": "Memory data to store"},
-                    "limit": {"type": "integer", "description": "Limit for results", "default": 10}
-                },
-                "required": ["operation"]
-            },
-            "chromadb_search": {
-                "type": "object",
-                "properties": {
-                    "operation": {
-                        "type": "string",
-                        "enum": ["search_session_history", "search_agent_memories", "search_a2a_messages"],
-                        "description": "ChromaDB operation to perform"
-                    },
-                    "query": {"type": "string", "description": "Search query"},
-                    "session_id": {"type": "string", "description": "Session ID (optional)"},
-                    "limit": {"type": "integer", "description": "Limit for results", "default": 10}
-                },
-                "required": ["operation", "query"]
-            },
-            "agent_memory": {
-                "type": "object",
-                "properties": {
-                    "operation": {
-                        "type": "string",
-                        "enum": ["update_stance", "add_reasoning", "add_proposal", "track_interaction"],
-                        "description": "Memory operation to perform"
-                    },
-                    "session_id": {"type": "string", "description": "Session ID"},
-                    "agent_id": {"type": "string", "description": "Agent ID"},
-                    "stance": {"type": "string", "description": "New stance"},
-                    "reasoning": {"type": "string", "description": "Reasoning to add"},
-                    "proposal": {"type": "string", "description": "Proposal to add"},
-                    "interaction": {"type": "object", "description": "Interaction to track"}
-                },
-                "required": ["operation", "session_id", "agent_id"]
-            },
-            "debate_history": {
-                "type": "object",
-                "properties": {
-                    "operation": {
-                        "type": "string",
-                        "enum": ["get_debate_context", "get_agent_interactions", "get_round_summary"],
-                        "description": "History operation to perform"
-                    },
-                    "session_id": {"type": "string", "description": "Session ID"},
-                    "target_agent_id": {"type": "string", "description": "Target agent ID"},
-                    "round_number": {"type": "integer", "description": "Round number"}
-                },
-                "required": ["operation", "session_id"]
-            }
-        }
-        
-        return parameter_schemas.get(tool_name, {
-            "type": "object",
-            "properties": {},
-            "required": []
-        })
+        return _TOOL_PARAMETER_SCHEMAS.get(tool_name, _EMPTY_TOOL_PARAMETERS)
 
     def _build_agent_instruction(self, agent: Agent) -> str:
         """
         Build comprehensive instructions for the ADK agent based on our Agent model.
         """
-        # Get available tools for instruction
-        available_tools = ", ".join(agent.mcp_tools) if agent.mcp_tools else "None"
-        
-        instruction = f"""
-        You are {agent.name}, participating in a multi-agent negotiation debate.
-        
-        Your Role: {agent.role}
-        Your Personality: {agent.personality}
-        Your Goals: {', '.join(agent.goals)}
-        Your Constraints: {', '.join(agent.constraints)}
-        Your Expertise: {', '.join(agent.expertise)}
-        Your Initial Stance: {agent.initial_stance}
-        Your Reasoning Style: {agent.reasoning_style}
-        Your Communication Style: {agent.communication_style}
-        
-        Available Tools: {available_tools}
-        
-        In this debate, you should:
-        1. Stay true to your role and personality
-        2. Pursue your goals while respecting your constraints
-        3. Use your expertise to make informed arguments
-        4. Communicate in your characteristic style
-        5. Be open to changing your position if presented with compelling arguments
-        6. Work towards consensus while maintaining your core principles
-        7. Use your available tools to:
-           - Access your memory and update your stance (agent_memory)
-           - Search for relevant information from debate history (chromadb_search)
-           - Get context about the current debate state (redis_memory)
-           - Review past interactions and rounds (debate_history)
-        
-        Tool Usage Guidelines:
-        - Use agent_memory to track your evolving stance and reasoning
-        - Use chromadb_search to find relevant precedents or similar arguments
-        - Use redis_memory to get recent messages and session context
-        - Use debate_history to understand interaction patterns with other agents
-        
-        Always respond as {agent.name} would, considering your unique perspective and motivations.
-        Make strategic use of your tools to enhance your reasoning and arguments.
-        """
-        return instruction.strip()
+        return _agent_instruction(
+            agent.name,
+            agent.role,
+            agent.personality,
+            agent.goals,
+            agent.constraints,
+            agent.expertise,
+            agent.initial_stance,
+            agent.reasoning_style,
+            agent.communication_style,
+            tuple(agent.mcp_tools),
+        )
+
+    @cached_property
+    def generation_providers(self) -> Tuple[str, ...]:
+        """Available providers in the order agent generation tries them, default first; clients are fixed at startup"""
+        available = self.llm_service.get_available_providers()
+        return tuple(p for p in dict.fromkeys([self.settings.default_llm_provider, *available]) if p in available)
+
+    @cached_property
+    def orchestrator_system_prompt(self) -> str:
+        """Orchestrator system prompt, built once: its inputs are fixed for the life of the service"""
+        return self._build_orchestrator_system_prompt()
 
     def _build_orchestrator_system_prompt(self) -> str:
         """
@@ -331,132 +743,69 @@ Focus on creating agents that will produce rich, meaningful debates with differe
     def _build_agent_generation_prompt(self, scenario: str, agent_count: int) -> str:
         """
         Build a prompt for the LLM to generate agent definitions.
+        The static instructions come first; only the short suffix is formatted per call.
         """
-        prompt = f"""You are an expert in stakeholder analysis and debate facilitation. Analyze the following scenario and dynamically generate {agent_count} diverse debate agents who would be most relevant to this specific topic.
-
-**Scenario:** {scenario}
-
-**Your Task:**
-1. First, identify the key stakeholder groups who would be most affected by or interested in this scenario
-2. Consider what types of expertise, perspectives, and interests would be most relevant
-3. Think about potential conflicts of interest and different viewpoints that would emerge
-4. Generate {agent_count} agents that represent the most important and diverse perspectives for THIS specific scenario
-
-**Requirements:**
-- Each agent must be highly relevant to the specific scenario provided
-- Agents should have realistic professional backgrounds that relate to the topic
-- Include both supporters and skeptics/opponents where appropriate
-- Ensure diverse expertise areas that would naturally contribute to this debate
-- Create agents with specific, actionable goals related to the scenario
-- Give each agent realistic constraints based on their role and responsibilities
-- Avoid generic roles - be specific to the domain and context
-
-**Guidelines for Agent Creation:**
-- Names should reflect realistic professional identities
-- Roles should be specific job titles or positions relevant to the scenario
-- Personalities should influence how they would approach this particular issue
-- Goals should be concrete and related to what someone in their position would actually want
-- Constraints should reflect real-world limitations they would face
-- Expertise should be directly applicable to the scenario
-- Initial stance should be nuanced and realistic for their background
-- Communication style should match their professional context
-
-**Available LLM Providers:** {', '.join(self.llm_service.get_available_providers())}
-
-**Output Format:** Return ONLY a JSON object with this exact structure:
-{{
-  "agents": [
-    {{
-      "name": "Agent Name",
-      "role": "Specific role title",
-      "personality": "Personality description",
-      "goals": ["goal1", "goal2", "goal3"],
-      "constraints": ["constraint1", "constraint2"],
-      "expertise": ["area1", "area2", "area3"],
-      "initial_stance": "Initial position on the scenario",
-      "reasoning_style": "How they approach problems",
-      "communication_style": "How they communicate"
-    }}
-  ]
-}}
-
-Focus on creating agents that will produce rich, meaningful debates with different perspectives."""
-
-        return prompt
+        return _AGENT_GENERATION_PROMPT_PREFIX + _AGENT_GENERATION_PROMPT_SUFFIX.format(
+            providers=', '.join(self.llm_service.get_available_providers()),
+            scenario=scenario,
+            agent_count=agent_count,
+        )
 
     async def _call_llm_via_adk(self, prompt: str) -> str:
         """
         Call the LLM via ADK model with the given prompt and return the response.
         """
-        # TODO: Implement actual ADK model call
-        # This should use the ADK model's generate method
-        # response = await self.model.generate(prompt)
-        # return response.content
+        if self.model is None:
+            raise RuntimeError("ADK model is not available")
         
-        # Placeholder for now
-        raise NotImplementedError("ADK LLM call not yet implemented.")
+        request = LlmRequest(
+            model=self.model.model,
+            contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
+            config=types.GenerateContentConfig(response_mime_type="application/json"),
+        )
+        # Non-streaming calls yield exactly one complete response
+        async for response in self.model.generate_content_async(request):
+            if response.content and response.content.parts:
+                return "".join(part.text or "" for part in response.content.parts)
+        raise RuntimeError("ADK model returned no content")
 
     def _parse_llm_response_to_agents(self, llm_response: str, agent_count: int = 3) -> List[Agent]:
         """
         Parse the LLM's response into a list of Agent model instances.
         """
-        import json
-        import re
-        
         try:
             # Clean the response - remove any markdown formatting
-            cleaned_response = llm_response.strip()
-            if cleaned_response.startswith('```json'):
-                cleaned_response = cleaned_response[7:]
-            if cleaned_response.endswith('```'):
-                cleaned_response = cleaned_response[:-3]
-            cleaned_response = cleaned_response.strip()
+            cleaned_response = _CODE_FENCE_RE.sub("", llm_response.strip())
             
             # Parse JSON
-            data = json.loads(cleaned_response)
+            data = orjson.loads(cleaned_response)
             
-            # Extract agents array
-            agents_data = data.get('agents', [])
-            if not agents_data:
-                # Fallback: try to find agents in the response
-                agents_data = data if isinstance(data, list) else []
+            # Extract agents array (some models return the bare array)
+            agents_data = data if isinstance(data, list) else data.get('agents', [])
             
-            agents = []
+            # Keep only the persona fields, filling gaps with defaults, then validate the whole list in one pass
+            definitions = []
             for agent_data in agents_data:
+                definition = {field: agent_data.get(field, default) for field, default in _GENERATED_AGENT_DEFAULTS.items()}
                 # Sanitize agent name for ADK compatibility
-                original_name = agent_data.get('name', 'Unknown Agent')
-                sanitized_name = self._sanitize_agent_name(original_name)
-                
-                # Create Agent instance with the parsed data
-                agent = Agent(
-                    name=sanitized_name,
-                    role=agent_data.get('role', 'General Participant'),
-                    personality=agent_data.get('personality', 'Balanced and thoughtful'),
-                    goals=agent_data.get('goals', ['Participate in debate']),
-                    constraints=agent_data.get('constraints', ['Be respectful']),
-                    expertise=agent_data.get('expertise', ['General knowledge']),
-                    initial_stance=agent_data.get('initial_stance', 'Open to discussion'),
-                    reasoning_style=agent_data.get('reasoning_style', 'Logical'),
-                    communication_style=agent_data.get('communication_style', 'Clear and direct')
-                )
-                agents.append(agent)
+                definition['name'] = self._sanitize_agent_name(definition['name'])
+                definitions.append(definition)
             
-            return agents
+            return AGENT_LIST_ADAPTER.validate_python(definitions)
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse agent JSON: {e}")
             logger.error(f"Response: {llm_response}")
-            # Return fallback agents
-            return self._create_fallback_agents(agent_count)
+            # Let the caller try the next provider (and fall back after the last one)
+            raise
         except Exception as e:
             logger.error(f"Error parsing agent response: {e}")
-            return self._create_fallback_agents(agent_count)
+            raise
     
     def _sanitize_agent_name(self, name: str) -> str:
         """Sanitize agent name for ADK compatibility"""
-        import re
         # Remove special characters and spaces, keep only alphanumeric and underscores
-        sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', name)
+        sanitized = _NAME_UNSAFE_RE.sub('_', name)
         # Ensure it starts with a letter or underscore
         if sanitized and not sanitized[0].isalpha() and sanitized[0] != '_':
             sanitized = f"agent_{sanitized}"
@@ -469,87 +818,17 @@ Focus on creating agents that will produce rich, meaningful debates with differe
 
     def _create_fallback_agents(self, agent_count: int = 3) -> List[Agent]:
         """Create fallback agents when parsing fails"""
-        base_agents = [
-            {
-                "name": "Analyst",
-                "role": "Data Analyst",
-                "personality": "Analytical and detail-oriented",
-                "goals": ["Provide data-driven insights"],
-                "constraints": ["Must base arguments on evidence"],
-                "expertise": ["Data analysis", "Statistics"],
-                "initial_stance": "Neutral, seeking evidence",
-                "reasoning_style": "Logical and systematic",
-                "communication_style": "Precise and factual"
-            },
-            {
-                "name": "Advocate",
-                "role": "User Advocate",
-                "personality": "Empathetic and passionate",
-                "goals": ["Represent user interests"],
-                "constraints": ["Must consider user impact"],
-                "expertise": ["User experience", "Human factors"],
-                "initial_stance": "Pro-user benefits",
-                "reasoning_style": "Empathetic and holistic",
-                "communication_style": "Persuasive and emotional"
-            },
-            {
-                "name": "Pragmatist",
-                "role": "Implementation Specialist",
-                "personality": "Practical and realistic",
-                "goals": ["Ensure feasible solutions"],
-                "constraints": ["Must consider practical limitations"],
-                "expertise": ["Implementation", "Resource management"],
-                "initial_stance": "Focused on feasibility",
-                "reasoning_style": "Practical and solution-oriented",
-                "communication_style": "Direct and pragmatic"
-            },
-            {
-                "name": "Innovator",
-                "role": "Innovation Lead",
-                "personality": "Creative and forward-thinking",
-                "goals": ["Drive innovation and new ideas"],
-                "constraints": ["Must consider long-term impact"],
-                "expertise": ["Innovation", "Technology trends"],
-                "initial_stance": "Focused on future opportunities",
-                "reasoning_style": "Creative and visionary",
-                "communication_style": "Inspiring and enthusiastic"
-            },
-            {
-                "name": "Strategist",
-                "role": "Business Strategist",
-                "personality": "Strategic and analytical",
-                "goals": ["Optimize business outcomes"],
-                "constraints": ["Must consider market dynamics"],
-                "expertise": ["Strategy", "Market analysis"],
-                "initial_stance": "Focused on competitive advantage",
-                "reasoning_style": "Strategic and comprehensive",
-                "communication_style": "Authoritative and clear"
-            },
-            {
-                "name": "Guardian",
-                "role": "Risk Manager",
-                "personality": "Cautious and thorough",
-                "goals": ["Minimize risks and protect interests"],
-                "constraints": ["Must consider potential downsides"],
-                "expertise": ["Risk assessment", "Compliance"],
-                "initial_stance": "Risk-averse and protective",
-                "reasoning_style": "Careful and methodical",
-                "communication_style": "Cautious and detailed"
-            }
-        ]
-        
         # Select the requested number of agents
-        selected_agents = base_agents[:min(agent_count, len(base_agents))]
+        selected_agents = _FALLBACK_AGENT_DEFINITIONS[:min(agent_count, len(_FALLBACK_AGENT_DEFINITIONS))]
         
         # If more agents requested than available, duplicate with variations
         agents = []
         for i in range(agent_count):
-            base_agent = selected_agents[i % len(selected_agents)]
-            agent_data = base_agent.copy()
+            agent_data = selected_agents[i % len(selected_agents)]
             
             # Add variation for duplicates
             if i >= len(selected_agents):
-                agent_data["name"] = f"{agent_data['name']} {i + 1}"
+                agent_data = {**agent_data, "name": f"{agent_data['name']} {i + 1}"}
                 
             agents.append(Agent(**agent_data))
         
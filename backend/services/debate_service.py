@@ -1,10 +1,12 @@
 from typing import List, Dict, Any, Optional
-from models.debate import DebateSession, Agent, DebateMessage, ConsensusResult
+from models.debate import DebateSession, Agent, AgentMemory, DebateMessage, ConsensusResult
 from services.memory_service import MemoryService
 from services.agent_service import AgentService
 from services.llm_service import MultiLLMService
 from utils.config import get_settings
 import asyncio
+from contextlib import aclosing
+import hashlib
 from loguru import logger
 from datetime import datetime
 
@@ -13,6 +15,28 @@ from google.adk.agents import Agent as ADKAgent
 # Note: A2A protocol not available in current ADK version, using placeholder
 # from google.adk.a2a import A2AProtocol, A2AMessage
 
+# How many of an agent's own latest messages are replayed to it each turn
+_OWN_MESSAGE_COUNT = 3
+
+_TURN_TASK_TEMPLATE = """
+**YOUR TASK:**
+As {name} ({role}), provide your response to the current debate. Consider:
+1. Your role and expertise: {expertise}
+2. Your goals: {goals}
+3. Your constraints: {constraints}
+4. Your reasoning style: {reasoning_style}
+5. Your communication style: {communication_style}
+
+**INSTRUCTIONS:**
+- Respond in character as {name}
+- Address the current debate topic directly
+- Consider other agents' points and respond appropriately
+- Maintain your personality: {personality}
+- Work toward your goals while respecting your constraints
+- Be constructive and aim for eventual consensus
+
+**YOUR RESPONSE:**"""
+
 class DebateService:
     def __init__(self, memory_service: MemoryService = None):
         self.settings = get_settings()
@@ -24,24 +48,51 @@ class DebateService:
         # ADK orchestrator and agent registry
         self.orchestrator: Optional[ADKAgent] = None  # Using generic agent as orchestrator for now
         self.agent_registry: Dict[str, ADKAgent] = {}
+        # Agent personas are fixed for the debate, so each system prompt is built once and reused
+        # byte-for-byte every round, which also keeps provider prompt caches warm
+        self.system_prompts: Dict[str, str] = {}
+        # The persona half of every turn prompt is just as fixed, so it is rendered once per agent too
+        self.turn_tasks: Dict[str, str] = {}
         # self.a2a_protocol = A2AProtocol()  # Not available in current ADK version
 
-    async def create_session(self, scenario: str, agents: List[Agent]) -> str:
+    async def shutdown(self):
+        """Release the ADK orchestrator and agent registry for this session"""
+        self.orchestrator = None
+        self.agent_registry.clear()
+        self.system_prompts.clear()
+        self.turn_tasks.clear()
+
+    async def publish_session_update(self, session: DebateSession):
+        """Publish the session's current state to WebSocket subscribers on every worker"""
+        await self.memory_service.publish_session_update(
+            session.id, session.session_update_json(self.orchestrator is not None)
+        )
+
+    async def register_agents(self, agents: List[Agent]) -> List[ADKAgent]:
         """
-        Create and initialize a new debate session with ADK orchestrator and agents.
+        Instantiate ADK agents for the given agent definitions and add them to the registry.
         """
-        # 1. Instantiate ADK agents from provided agent definitions using AgentService
         adk_agents = []
         for agent in agents:
             try:
                 adk_agent = await self.agent_service.create_adk_agent(agent)
                 self.agent_registry[agent.id] = adk_agent
+                self.system_prompts[agent.id] = self._build_agent_system_prompt(agent)
+                self.turn_tasks[agent.id] = self._build_agent_turn_task(agent)
                 adk_agents.append(adk_agent)
             except Exception as e:
                 logger.warning(f"Failed to create ADK agent for {agent.name}: {e}")
                 # Continue with other agents
+        return adk_agents
+
+    async def create_session(self, scenario: str, agents: List[Agent]) -> str:
+        """
+        Create and initialize a new debate session with ADK orchestrator and agents.
+        """
+        # 1. Instantiate ADK agents from provided agent definitions using AgentService
+        await self.register_agents(agents)
         # 2. Create ADK orchestrator for this session (placeholder for now)
-        # self.orchestrator = Orchestrator(agents=adk_agents, protocol=self.a2a_protocol)
+        # self.orchestrator = Orchestrator(agents=list(self.agent_registry.values()), protocol=self.a2a_protocol)
         # Using placeholder until proper ADK orchestrator is available
         self.orchestrator = None
         # 3. Create and store DebateSession as before
@@ -65,165 +116,295 @@ class DebateService:
         """
         logger.info(f"Starting ADK debate for session {session_id}")
         max_rounds = session.max_rounds
+        # Recall each agent's relevant memories once, up front, rather than fetching them every turn.
+        # This happens here and not in create_session: the debate may start on a different worker than the
+        # one that created the session, and memories stored in between would be missed. The snapshot does
+        # not see this debate's own turns, so those are replayed from the session every round instead.
+        agent_memories = await self.memory_service.get_agent_memories(
+            session_id, [agent.id for agent in session.agents]
+        )
+        for memory in agent_memories.values():
+            memory.adk_context["preloaded"] = memory.retrieve(session.scenario, self.settings.memory_preload_count)
+        # Each round is persisted in the background while the next round's LLM calls are in flight
+        pending_persist: Optional[asyncio.Task] = None
+        last_consensus_digest: Optional[bytes] = None
         for round_num in range(session.current_round + 1, max_rounds + 1):
             session.current_round = round_num
+            await self.publish_session_update(session)
             logger.info(f"Round {round_num} begins (ADK)")
-            round_messages = []
-            for agent in session.agents:
-                adk_agent = self.agent_registry.get(agent.id)
-                if not adk_agent:
-                    logger.error(f"ADK agent not found for {agent.name}")
-                    continue
-                
-                # 1. Build context for agent (previous messages, agent memory, etc.)
-                context = await self._build_agent_context(session, agent)
-                
-                # 2. Generate agent response using their assigned LLM provider
-                try:
-                    agent_prompt = self._build_agent_prompt(agent, context, round_num)
-                    system_prompt = self._build_agent_system_prompt(agent)
-                    
-                    # Use the agent's assigned LLM provider
-                    llm_response = await self.llm_service.generate_agent_response(
-                        agent=agent,
-                        prompt=agent_prompt,
-                        system_prompt=system_prompt,
-                        provider=agent.llm_provider
-                    )
-                    
-                    # 3. Create A2A message for agent's turn
-                    a2a_message = self._build_a2a_message(agent, context, round_num)
-                    
-                    # 4. Create DebateMessage with LLM response
-                    message = DebateMessage(
-                        session_id=session.id,
-                        agent_id=agent.id,
-                        agent_name=agent.name,
-                        message_type="argument",
-                        content=llm_response.content,
-                        round_number=round_num,
-                        metadata={
-                            "llm_provider": llm_response.provider,
-                            "llm_model": llm_response.model,
-                            "tokens_used": llm_response.tokens_used,
-                            "finish_reason": llm_response.finish_reason
-                        }
-                    )
-                    
-                    logger.info(f"Agent {agent.name} ({llm_response.provider}) responded in round {round_num}")
-                    
-                except Exception as e:
-                    logger.error(f"Error generating response for {agent.name}: {e}")
-                    # Fallback message
-                    message = DebateMessage(
-                        session_id=session.id,
-                        agent_id=agent.id,
-                        agent_name=agent.name,
-                        message_type="argument",
-                        content=f"[Error] Agent {agent.name} encountered an error in round {round_num}.",
-                        round_number=round_num,
-                        metadata={"error": str(e)}
-                    )
-                
-                session.messages.append(message)
-                round_messages.append(message)
-                await self.memory_service.store_debate_message(message)
-            # 5. Evaluate consensus after each round
+            # Agents respond to the state at the start of the round, so their LLM calls run concurrently
+            # (bounded by the per-provider limits in MultiLLMService) and are recorded in seating order
+            # 1. Build context for each agent (previous messages, agent memory, etc.)
+            round_context = self._build_round_context(session)
+            turns = await asyncio.gather(*[
+                self._run_agent_turn(
+                    session, agent, self._build_agent_context(round_context, agent, agent_memories.get(agent.id)), round_num
+                )
+                for agent in session.agents
+            ])
+            round_messages = [message for message in turns if message is not None]
+            
+            # Keep a bounded window in memory; every message is also persisted to Redis below
+            session.add_messages(round_messages, self.settings.max_session_history)
+            await self.publish_session_update(session)
+            # Wait for the previous round's writes first so the Redis message list stays in order
+            if pending_persist:
+                await pending_persist
+            pending_persist = asyncio.create_task(self._persist_round(session, round_messages, round_num))
+            # 5. Evaluate consensus after each round that brought new arguments
+            round_digest = hashlib.blake2b(
+                b"\0".join(message.content.encode() for message in round_messages), digest_size=8
+            ).digest()
+            if not self._should_evaluate_consensus(round_num, round_messages, round_digest, last_consensus_digest):
+                continue
+            last_consensus_digest = round_digest
             consensus = await self.evaluate_consensus(session_id)
             if consensus.get("consensus_reached", False):
                 session.consensus_reached = True
                 session.consensus_result = ConsensusResult(**consensus)
                 session.status = "consensus_reached"
+                await pending_persist
+                await self.memory_service.store_session(session)
+                await self.publish_session_update(session)
                 logger.info(f"Consensus reached in round {round_num}")
                 break
-            # 6. Update session state
-            await self.memory_service.store_session(session)
+        if pending_persist:
+            await pending_persist
         # End debate if max rounds reached
         if not session.consensus_reached:
             session.status = "ended"
+            await self.publish_session_update(session)
             await self.memory_service.store_session(session)
             logger.info(f"Debate ended without consensus: {session_id}")
 
-    def _build_a2a_message(self, agent: Agent, context: Dict[str, Any], round_num: int) -> Dict[str, Any]:
+    def _should_evaluate_consensus(
+        self,
+        round_num: int,
+        round_messages: List[DebateMessage],
+        round_digest: bytes,
+        last_digest: Optional[bytes]
+    ) -> bool:
+        """
+        Whether a finished round warrants a consensus check: auto checks are enabled, enough rounds
+        have been played, and the round produced content that differs from the last evaluated one
+        """
+        return (
+            self.settings.debate_auto_consensus_check
+            and round_num >= self.settings.debate_min_consensus_rounds
+            and bool(round_messages)
+            and round_digest != last_digest
+        )
+
+    async def _persist_round(self, session: DebateSession, round_messages: List[DebateMessage], round_num: int):
         """
-        Build an A2A protocol message for the agent's turn (placeholder).
+        Store a finished round's messages and the updated session state.
+        Runs in the background, so failures are logged rather than aborting the debate.
+        """
+        try:
+            for message in round_messages:
+                await self.memory_service.store_debate_message(message)
+        except Exception as e:
+            logger.error(f"Could not store round {round_num} messages: {e}")
+        # Index the whole round for semantic search in one ChromaDB write
+        try:
+            await self.memory_service.store_debate_messages_history(round_messages)
+        except Exception as e:
+            logger.warning(f"Could not index round {round_num} messages: {e}")
+        # 6. Update session state
+        try:
+            await self.memory_service.store_session(session)
+        except Exception as e:
+            logger.error(f"Could not store session state after round {round_num}: {e}")
+
+    async def _run_agent_turn(
+        self,
+        session: DebateSession,
+        agent: Agent,
+        context: Dict[str, Any],
+        round_num: int
+    ) -> Optional[DebateMessage]:
         """
-        # TODO: Map context and agent state to A2A message fields
-        # Using dict placeholder until A2A protocol is available
+        Generate one agent's message for the round. Returns None if the agent has no ADK registration.
+        """
+        adk_agent = self.agent_registry.get(agent.id)
+        if not adk_agent:
+            logger.error(f"ADK agent not found for {agent.name}")
+            return None
+        
+        # 2. Generate agent response using their assigned LLM provider
+        try:
+            agent_prompt = self._build_agent_prompt(agent, context, round_num)
+            system_prompt = self.system_prompts[agent.id]
+            
+            # Use the agent's assigned LLM provider, streaming partial text to subscribers as it arrives
+            provider = agent.llm_provider or self.settings.default_llm_provider
+            # Deltas are published by a sibling task so slow pub/sub never holds up reading the stream
+            parts: List[str] = []
+            stream_done = asyncio.Event()
+            publisher = asyncio.create_task(self._publish_typing_deltas(session, agent, round_num, parts, stream_done))
+            try:
+                # aclosing releases the provider's concurrency slot as soon as the turn ends, even on error
+                async with aclosing(self.llm_service.stream_agent_response(
+                    agent=agent,
+                    prompt=agent_prompt,
+                    system_prompt=system_prompt,
+                    provider=provider
+                )) as stream:
+                    async for chunk in stream:
+                        parts.append(chunk)
+            finally:
+                # Let an in-flight delta land before the final debate_message so clients see them in order
+                stream_done.set()
+                await publisher
+            llm_response = stream.response
+            
+            # 3. No A2A message is built for the turn: nothing can send one until the protocol is available
+            
+            # 4. Create DebateMessage with LLM response
+            message = DebateMessage(
+                session_id=session.id,
+                agent_id=agent.id,
+                agent_name=agent.name,
+                message_type="argument",
+                content=llm_response.content,
+                round_number=round_num,
+                metadata={
+                    "llm_provider": llm_response.provider,
+                    "llm_model": llm_response.model,
+                    "tokens_used": llm_response.tokens_used,
+                    "finish_reason": llm_response.finish_reason
+                }
+            )
+            
+            logger.info(f"Agent {agent.name} ({llm_response.provider}) responded in round {round_num}")
+            
+        except Exception as e:
+            logger.error(f"Error generating response for {agent.name}: {e}")
+            # Fallback message
+            message = DebateMessage(
+                session_id=session.id,
+                agent_id=agent.id,
+                agent_name=agent.name,
+                message_type="argument",
+                content=f"[Error] Agent {agent.name} encountered an error in round {round_num}.",
+                round_number=round_num,
+                metadata={"error": str(e)}
+            )
+        
+        await self.memory_service.publish_session_update(
+            session.id, {"type": "debate_message", "message": message.model_dump(mode="json")}
+        )
+        return message
+
+    async def _publish_typing_deltas(
+        self,
+        session: DebateSession,
+        agent: Agent,
+        round_num: int,
+        parts: List[str],
+        stream_done: asyncio.Event
+    ):
+        """Every debate_stream_interval, publish the chunks appended to parts since the last event, until the stream is done"""
+        published = 0
+        while not stream_done.is_set():
+            try:
+                await asyncio.wait_for(stream_done.wait(), self.settings.debate_stream_interval)
+            except asyncio.TimeoutError:
+                pass
+            if stream_done.is_set():
+                # The final debate_message carries the full text
+                return
+            end = len(parts)
+            if end > published:
+                await self._publish_agent_typing(session, agent, round_num, "".join(parts[published:end]))
+                published = end
+
+    async def _publish_agent_typing(self, session: DebateSession, agent: Agent, round_num: int, delta: str):
+        """Publish the text an agent has streamed since its last agent_typing event"""
+        await self.memory_service.publish_session_update(session.id, {
+            "type": "agent_typing",
+            "agent_id": agent.id,
+            "agent_name": agent.name,
+            "round_number": round_num,
+            "delta": delta,
+        })
+
+    def _build_round_context(self, session: DebateSession) -> Dict[str, Any]:
+        """
+        Build the context shared by every agent in a round; the history is formatted once here
+        since all turns see the same snapshot.
+        """
+        # For MVP, just provide last N messages
+        messages = session.messages[-5:]
+        # Each agent's own latest messages, newest first, so it keeps sight of its proposals and reasoning
+        own_messages: Dict[str, List[str]] = {}
+        for msg in reversed(session.messages):
+            own = own_messages.setdefault(msg.agent_id, [])
+            if len(own) < _OWN_MESSAGE_COUNT:
+                own.append(msg.content)
         return {
-            "sender": agent.name,
-            "content": f"[A2A Stub] Agent {agent.name} turn in round {round_num}.",
-            "round": round_num,
-            "context": context
+            "recent_messages": messages,
+            "own_messages": own_messages,
+            "conversation_history": "\n".join(f"{msg.agent_name}: {msg.content}" for msg in messages),
+            "scenario": session.scenario,
+            "round": session.current_round,
         }
 
-    async def _build_agent_context(self, session: DebateSession, agent: Agent) -> Dict[str, Any]:
+    def _build_agent_context(
+        self, round_context: Dict[str, Any], agent: Agent, agent_memory: Optional[AgentMemory]
+    ) -> Dict[str, Any]:
         """
         Build the context for an agent's turn (history, memory, etc.).
         """
-        # For MVP, just provide last N messages and agent's own memory
-        messages = session.messages[-5:] if len(session.messages) > 5 else session.messages
-        agent_memory = await self.memory_service.get_agent_memory(session.id, agent.id)
         return {
-            "recent_messages": messages,
+            **round_context,
+            "own_messages": round_context["own_messages"].get(agent.id, []),
             "agent_memory": agent_memory,
-            "scenario": session.scenario,
-            "round": session.current_round,
         }
 
     def _build_agent_prompt(self, agent: Agent, context: Dict[str, Any], round_num: int) -> str:
         """
         Build the prompt for an agent's turn in the debate
         """
-        recent_messages = context.get("recent_messages", [])
-        agent_memory = context.get("agent_memory", {})
+        conversation_history = context.get("conversation_history", "")
+        agent_memory = context.get("agent_memory")
+        own_messages = context.get("own_messages", [])
         scenario = context.get("scenario", "")
         
-        # Build recent conversation history
-        conversation_history = ""
-        if recent_messages:
-            conversation_history = "\n".join([
-                f"{msg.agent_name}: {msg.content}" 
-                for msg in recent_messages[-5:]  # Last 5 messages
-            ])
-        
         # Build agent memory summary
         memory_summary = ""
+        if own_messages:
+            memory_summary += f"""
+Your recent contributions to this debate: {'; '.join(reversed(own_messages))}"""
         if agent_memory:
-            memory_summary = f"""
-Your current stance: {agent_memory.get('current_stance', 'Not set')}
-Your past proposals: {', '.join(agent_memory.get('past_proposals', []))}
-Your past reasoning: {', '.join(agent_memory.get('past_reasoning', []))}
-"""
+            memory_summary += f"""
+Your current stance: {agent_memory.current_stance or 'Not set'}
+What you recall that bears on this scenario: {'; '.join(agent_memory.adk_context.get('preloaded', []))}"""
+        if memory_summary:
+            memory_summary += "\n"
         
-        prompt = f"""**DEBATE SCENARIO:** {scenario}
-
-**ROUND {round_num}** - It's your turn to contribute to the debate.
-
-**RECENT CONVERSATION:**
-{conversation_history or "No previous messages"}
+        return "".join((
+            "**DEBATE SCENARIO:** ", scenario,
+            "\n\n**ROUND ", str(round_num), "** - It's your turn to contribute to the debate.",
+            "\n\n**RECENT CONVERSATION:**\n", conversation_history or "No previous messages",
+            "\n\n**YOUR MEMORY:**", memory_summary, "\n",
+            self.turn_tasks.get(agent.id) or self._build_agent_turn_task(agent),
+        ))
 
-**YOUR MEMORY:**{memory_summary}
-
-**YOUR TASK:**
-As {agent.name} ({agent.role}), provide your response to the current debate. Consider:
-1. Your role and expertise: {', '.join(agent.expertise)}
-2. Your goals: {', '.join(agent.goals)}
-3. Your constraints: {', '.join(agent.constraints)}
-4. Your reasoning style: {agent.reasoning_style}
-5. Your communication style: {agent.communication_style}
-
-**INSTRUCTIONS:**
-- Respond in character as {agent.name}
-- Address the current debate topic directly
-- Consider other agents' points and respond appropriately
-- Maintain your personality: {agent.personality}
-- Work toward your goals while respecting your constraints
-- Be constructive and aim for eventual consensus
-
-**YOUR RESPONSE:**"""
-        
-        return prompt
+    def _build_agent_turn_task(self, agent: Agent) -> str:
+        """
+        Render the persona-specific task and instructions that close every turn prompt
+        """
+        return _TURN_TASK_TEMPLATE.format(
+            name=agent.name,
+            role=agent.role,
+            expertise=", ".join(agent.expertise),
+            goals=", ".join(agent.goals),
+            constraints=", ".join(agent.constraints),
+            reasoning_style=agent.reasoning_style,
+            communication_style=agent.communication_style,
+            personality=agent.personality,
+        )
     
     def _build_agent_system_prompt(self, agent: Agent) -> str:
         """
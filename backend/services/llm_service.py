@@ -5,12 +5,13 @@ Supports OpenAI, Anthropic, and Google LLM providers with unified interface
 
 import asyncio
 import random
+import re
 import json
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
 from enum import Enum
 from dataclasses import dataclass
 from loguru import logger
-import json
+import httpx
 
 # LLM Provider imports
 import openai
@@ -22,6 +23,46 @@ from utils.config import get_settings
 from models.debate import Agent
 
 
+# One HTTP/2 connection pool for the OpenAI and Anthropic SDK clients of every MultiLLMService,
+# so concurrent agent turns across sessions multiplex over warm connections instead of new handshakes
+_http_client: Optional[httpx.AsyncClient] = None
+
+def shared_http_client() -> httpx.AsyncClient:
+    """The process-wide HTTP client for provider SDKs, created on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        settings = get_settings()
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections,
+            ),
+        )
+    return _http_client
+
+async def close_shared_http_client():
+    """Close the process-wide provider HTTP client on application shutdown"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# Per-provider cap on in-flight calls, shared by every MultiLLMService so that concurrent
+# sessions together stay under the provider's rate limits instead of getting throttled
+_provider_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+def provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """The process-wide concurrency limit for a provider, sized from its settings"""
+    semaphore = _provider_semaphores.get(provider)
+    if semaphore is None:
+        semaphore = _provider_semaphores[provider] = asyncio.Semaphore(
+            get_settings().get_llm_config(provider)["max_concurrency"]
+        )
+    return semaphore
+
+
 class LLMProvider(str, Enum):
     """Supported LLM providers"""
     OPENAI = "openai"
@@ -40,6 +81,31 @@ class LLMResponse:
     metadata: Dict[str, Any] = None
 
 
+class LLMStream:
+    """Text chunks of a streamed response; once exhausted, `response` holds the full LLMResponse"""
+    
+    def __init__(self, chunks: AsyncIterator[str], response: LLMResponse):
+        self.response = response
+        self._chunks = chunks
+        self._parts: List[str] = []
+    
+    def __aiter__(self) -> "LLMStream":
+        return self
+    
+    async def __anext__(self) -> str:
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.response.content = "".join(self._parts)
+            raise
+        self._parts.append(chunk)
+        return chunk
+    
+    async def aclose(self):
+        """Stop the underlying provider stream, releasing its connection and concurrency slot"""
+        await self._chunks.aclose()
+
+
 class LLMSelectionStrategy:
     """Strategies for selecting LLM providers for agents"""
     
@@ -134,6 +200,7 @@ class MultiLLMService:
     def __init__(self):
         self.settings = get_settings()
         self.clients = {}
+        self.google_models: Dict[str, Any] = {}  # Non-default Gemini models, created on demand
         self._initialize_clients()
     
     def _initialize_clients(self):
@@ -144,7 +211,8 @@ class MultiLLMService:
             self.clients[LLMProvider.OPENAI] = openai.AsyncOpenAI(
                 api_key=self.settings.openai_api_key,
                 organization=self.settings.openai_organization,
-                timeout=self.settings.openai_timeout
+                timeout=self.settings.openai_timeout,
+                http_client=shared_http_client()
             )
             logger.info("OpenAI client initialized")
         
@@ -152,7 +220,8 @@ class MultiLLMService:
         if self.settings.anthropic_api_key:
             self.clients[LLMProvider.ANTHROPIC] = anthropic.AsyncAnthropic(
                 api_key=self.settings.anthropic_api_key,
-                timeout=self.settings.anthropic_timeout
+                timeout=self.settings.anthropic_timeout,
+                http_client=shared_http_client()
             )
             logger.info("Anthropic client initialized")
         
@@ -167,6 +236,14 @@ class MultiLLMService:
             except Exception as e:
                 logger.warning(f"Failed to initialize Google client: {e}")
     
+    def _google_model(self, model_name: str):
+        """GenerativeModel for the given model name; the default one is the registered client"""
+        if model_name == self.settings.google_default_model:
+            return self.clients[LLMProvider.GOOGLE]
+        if model_name not in self.google_models:
+            self.google_models[model_name] = genai.GenerativeModel(model_name=model_name)
+        return self.google_models[model_name]
+    
     def get_available_providers(self) -> List[str]:
         """Get list of available LLM providers"""
         return list(self.clients.keys())
@@ -203,10 +280,14 @@ class MultiLLMService:
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        json_output: bool = False,
+        model: Optional[str] = None,
         **kwargs
     ) -> LLMResponse:
         """
-        Generate response from specified LLM provider
+        Generate response from specified LLM provider.
+        model overrides the provider's default model for this call.
+        With json_output, providers that support a JSON mode are constrained to emit bare JSON.
         """
         # Check if we should use mock mode for agent generation
         if ("generate" in prompt.lower() and "agents" in prompt.lower()) or "debate agents" in prompt.lower():
@@ -231,29 +312,46 @@ class MultiLLMService:
             raise ValueError(f"Provider {provider} not available. Available: {list(self.clients.keys())}")
         
         try:
-            if provider == LLMProvider.OPENAI:
-                return await self._generate_openai_response(
-                    prompt, system_prompt, temperature, max_tokens, **kwargs
-                )
-            elif provider == LLMProvider.ANTHROPIC:
-                return await self._generate_anthropic_response(
-                    prompt, system_prompt, temperature, max_tokens, **kwargs
-                )
-            elif provider == LLMProvider.GOOGLE:
-                return await self._generate_google_response(
-                    prompt, system_prompt, temperature, max_tokens, **kwargs
+            async with provider_semaphore(provider):
+                return await self._dispatch_response(
+                    prompt, provider, system_prompt, temperature, max_tokens, json_output, model, **kwargs
                 )
-            else:
-                raise ValueError(f"Unknown provider: {provider}")
         
         except Exception as e:
             logger.error(f"Error generating response from {provider}: {e}")
             raise
     
+    async def _dispatch_response(
+        self,
+        prompt: str,
+        provider: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        json_output: bool,
+        model: Optional[str],
+        **kwargs
+    ) -> LLMResponse:
+        """Call the provider-specific generate method"""
+        if provider == LLMProvider.OPENAI:
+            if json_output:
+                kwargs.setdefault("response_format", {"type": "json_object"})
+            return await self._generate_openai_response(
+                prompt, system_prompt, temperature, max_tokens, model=model, **kwargs
+            )
+        elif provider == LLMProvider.ANTHROPIC:
+            return await self._generate_anthropic_response(
+                prompt, system_prompt, temperature, max_tokens, model=model, **kwargs
+            )
+        elif provider == LLMProvider.GOOGLE:
+            return await self._generate_google_response(
+                prompt, system_prompt, temperature, max_tokens, json_output=json_output, model=model, **kwargs
+            )
+        else:
+            raise ValueError(f"Unknown provider: {provider}")
+    
     async def _generate_mock_agent_response(self, prompt: str) -> LLMResponse:
         """Generate mock topic-specific agents when API keys aren't available"""
-        import re
-        
         # Extract scenario from prompt
         scenario_match = re.search(r'\*\*Scenario:\*\*\s*(.+)', prompt, re.IGNORECASE)
         scenario = scenario_match.group(1).strip() if scenario_match else "general topic"
@@ -279,8 +377,6 @@ class MultiLLMService:
     
     def _generate_topic_specific_agents(self, scenario: str, agent_count: int) -> list:
         """Generate topic-specific agent configurations"""
-        import json
-        
         # Analyze scenario to determine relevant stakeholders
         scenario_lower = scenario.lower()
         logger.info(f"Analyzing scenario: '{scenario_lower}' for keywords")
@@ -589,8 +685,6 @@ class MultiLLMService:
     
     async def _generate_mock_debate_response(self, prompt: str, provider: str, system_prompt: Optional[str] = None) -> LLMResponse:
         """Generate mock debate responses when API keys aren't available"""
-        import re
-        
         # Debug: Log a portion of both prompts to see their structure
         logger.info(f"User prompt preview (first 100 chars): {prompt[:100]}...")
         if system_prompt:
@@ -704,47 +798,86 @@ class MultiLLMService:
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        model: Optional[str] = None,
         **kwargs
     ) -> LLMResponse:
         """Generate response using OpenAI"""
         client = self.clients[LLMProvider.OPENAI]
+        request = self._openai_request(prompt, system_prompt, temperature, max_tokens, model, **kwargs)
+        model = request["model"]
         
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        response = await client.chat.completions.create(
-            model=self.settings.openai_default_model,
-            messages=messages,
-            temperature=temperature or self.settings.openai_temperature,
-            max_tokens=max_tokens or self.settings.openai_max_tokens,
-            **kwargs
-        )
+        response = await client.chat.completions.create(**request)
         
         return LLMResponse(
             content=response.choices[0].message.content,
             provider=LLMProvider.OPENAI,
-            model=self.settings.openai_default_model,
+            model=model,
             tokens_used=response.usage.total_tokens if response.usage else None,
             finish_reason=response.choices[0].finish_reason,
             metadata={"response_id": response.id}
         )
     
+    def _openai_request(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        model: Optional[str],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Chat completion arguments shared by the OpenAI generate and stream paths"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        return {
+            "model": model or self.settings.openai_default_model,
+            "messages": messages,
+            "temperature": temperature or self.settings.openai_temperature,
+            "max_tokens": max_tokens or self.settings.openai_max_tokens,
+            **kwargs
+        }
+    
     async def _generate_anthropic_response(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        model: Optional[str] = None,
         **kwargs
     ) -> LLMResponse:
         """Generate response using Anthropic"""
         client = self.clients[LLMProvider.ANTHROPIC]
+        message_kwargs = self._anthropic_request(prompt, system_prompt, temperature, max_tokens, model, **kwargs)
+        model = message_kwargs["model"]
         
+        response = await client.messages.create(**message_kwargs)
+        
+        return LLMResponse(
+            content=response.content[0].text,
+            provider=LLMProvider.ANTHROPIC,
+            model=model,
+            tokens_used=response.usage.input_tokens + response.usage.output_tokens,
+            finish_reason=response.stop_reason,
+            metadata={"response_id": response.id}
+        )
+    
+    def _anthropic_request(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        model: Optional[str],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Messages API arguments shared by the Anthropic generate and stream paths"""
         # Anthropic uses system parameter separately
         message_kwargs = {
-            "model": self.settings.anthropic_default_model,
+            "model": model or self.settings.anthropic_default_model,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": temperature or self.settings.anthropic_temperature,
             "max_tokens": max_tokens or self.settings.anthropic_max_tokens,
@@ -754,16 +887,7 @@ class MultiLLMService:
         if system_prompt:
             message_kwargs["system"] = system_prompt
         
-        response = await client.messages.create(**message_kwargs)
-        
-        return LLMResponse(
-            content=response.content[0].text,
-            provider=LLMProvider.ANTHROPIC,
-            model=self.settings.anthropic_default_model,
-            tokens_used=response.usage.input_tokens + response.usage.output_tokens,
-            finish_reason=response.stop_reason,
-            metadata={"response_id": response.id}
-        )
+        return message_kwargs
     
     async def _generate_google_response(
         self,
@@ -771,21 +895,14 @@ class MultiLLMService:
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        json_output: bool = False,
+        model: Optional[str] = None,
         **kwargs
     ) -> LLMResponse:
         """Generate response using Google Generative AI"""
-        model = self.clients[LLMProvider.GOOGLE]
-        
-        # Combine system prompt with user prompt for Google
-        full_prompt = prompt
-        if system_prompt:
-            full_prompt = f"{system_prompt}\n\nUser: {prompt}"
-        
-        # Configure generation parameters
-        generation_config = genai.types.GenerationConfig(
-            temperature=temperature or self.settings.google_temperature,
-            max_output_tokens=max_tokens or self.settings.google_max_tokens,
-        )
+        model_name = model or self.settings.google_default_model
+        model = self._google_model(model_name)
+        full_prompt, generation_config = self._google_request(prompt, system_prompt, temperature, max_tokens, json_output)
         
         # Generate response
         response = await model.generate_content_async(
@@ -796,12 +913,130 @@ class MultiLLMService:
         return LLMResponse(
             content=response.text,
             provider=LLMProvider.GOOGLE,
-            model=self.settings.google_default_model,
+            model=model_name,
             tokens_used=None,  # Google doesn't provide token count in basic API
             finish_reason=str(response.candidates[0].finish_reason) if response.candidates else None,
             metadata={"response_id": getattr(response, 'id', None)}
         )
     
+    def _google_request(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        json_output: bool = False
+    ) -> Tuple[str, Any]:
+        """Prompt and generation config shared by the Google generate and stream paths"""
+        # Combine system prompt with user prompt for Google
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\nUser: {prompt}"
+        
+        # Configure generation parameters
+        generation_config = genai.types.GenerationConfig(
+            temperature=temperature or self.settings.google_temperature,
+            max_output_tokens=max_tokens or self.settings.google_max_tokens,
+            response_mime_type="application/json" if json_output else None,
+        )
+        return full_prompt, generation_config
+    
+    def stream_response(
+        self,
+        prompt: str,
+        provider: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> "LLMStream":
+        """
+        Stream a response from the specified LLM provider as text chunks.
+        Once the stream is exhausted, its response carries the serving model, token usage and finish reason.
+        In mock mode the whole mock response arrives as a single chunk.
+        """
+        response = LLMResponse(content="", provider=provider, model=model, metadata={})
+        return LLMStream(
+            self._stream_chunks(response, prompt, provider, system_prompt, temperature, max_tokens, model, **kwargs),
+            response
+        )
+    
+    async def _stream_chunks(
+        self,
+        response: LLMResponse,
+        prompt: str,
+        provider: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        model: Optional[str],
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Yield a provider's streamed text, recording its response details on `response` as they arrive"""
+        if self._should_use_mock_mode():
+            mock = await self.generate_response(prompt, provider, system_prompt, temperature, max_tokens, model=model, **kwargs)
+            response.model, response.tokens_used, response.finish_reason = mock.model, mock.tokens_used, mock.finish_reason
+            yield mock.content
+            return
+        
+        if provider not in self.clients:
+            raise ValueError(f"Provider {provider} not available. Available: {list(self.clients.keys())}")
+        
+        try:
+            async with provider_semaphore(provider):
+                if provider == LLMProvider.OPENAI:
+                    request = self._openai_request(prompt, system_prompt, temperature, max_tokens, model, **kwargs)
+                    response.model = request["model"]
+                    # The final chunk carries usage for the whole response, with no choices
+                    stream = await self.clients[LLMProvider.OPENAI].chat.completions.create(
+                        stream=True, stream_options={"include_usage": True}, **request
+                    )
+                    async for chunk in stream:
+                        response.model = chunk.model or response.model
+                        response.metadata["response_id"] = chunk.id
+                        if chunk.usage:
+                            response.tokens_used = chunk.usage.total_tokens
+                        if chunk.choices:
+                            if chunk.choices[0].finish_reason:
+                                response.finish_reason = chunk.choices[0].finish_reason
+                            if chunk.choices[0].delta.content:
+                                yield chunk.choices[0].delta.content
+                elif provider == LLMProvider.ANTHROPIC:
+                    message_kwargs = self._anthropic_request(prompt, system_prompt, temperature, max_tokens, model, **kwargs)
+                    response.model = message_kwargs["model"]
+                    async with self.clients[LLMProvider.ANTHROPIC].messages.stream(**message_kwargs) as stream:
+                        async for text in stream.text_stream:
+                            yield text
+                        final = await stream.get_final_message()
+                    response.model = final.model
+                    response.tokens_used = final.usage.input_tokens + final.usage.output_tokens
+                    response.finish_reason = final.stop_reason
+                    response.metadata["response_id"] = final.id
+                elif provider == LLMProvider.GOOGLE:
+                    response.model = model or self.settings.google_default_model
+                    google_model = self._google_model(response.model)
+                    full_prompt, generation_config = self._google_request(prompt, system_prompt, temperature, max_tokens)
+                    stream = await google_model.generate_content_async(
+                        full_prompt,
+                        generation_config=generation_config,
+                        stream=True
+                    )
+                    async for chunk in stream:
+                        if chunk.candidates and chunk.candidates[0].finish_reason:
+                            response.finish_reason = str(chunk.candidates[0].finish_reason)
+                        usage = getattr(chunk, "usage_metadata", None)
+                        if usage and usage.total_token_count:
+                            response.tokens_used = usage.total_token_count
+                        if chunk.parts:
+                            yield chunk.text
+                else:
+                    raise ValueError(f"Unknown provider: {provider}")
+        
+        except Exception as e:
+            logger.error(f"Error streaming response from {provider}: {e}")
+            raise
+    
     def select_llm_for_agent(self, scenario: str, agent: Agent) -> str:
         """
         Select the best LLM provider for a specific agent based on scenario and role
@@ -864,6 +1099,27 @@ class MultiLLMService:
             **kwargs
         )
     
+    def stream_agent_response(
+        self,
+        agent: Agent,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        provider: Optional[str] = None,
+        **kwargs
+    ) -> LLMStream:
+        """
+        Stream a response for a specific agent using their assigned LLM provider
+        """
+        if not provider:
+            provider = getattr(agent, 'llm_provider', self.settings.default_llm_provider)
+        
+        return self.stream_response(
+            prompt=prompt,
+            provider=provider,
+            system_prompt=system_prompt,
+            **kwargs
+        )
+    
     def get_provider_info(self) -> Dict[str, Any]:
         """Get information about available providers"""
         info = {}
@@ -10,7 +10,7 @@ import json
 from datetime import datetime
 
 from services.memory_service import MemoryService
-from models.debate import AgentMemory, DebateMessage, A2AMessage
+from models.debate import AgentMemory, DebateMessage, A2AMessage, DEBATE_MESSAGE_LIST_ADAPTER, A2A_MESSAGE_LIST_ADAPTER
 
 
 class MCPToolResult(BaseModel):
@@ -96,7 +96,7 @@ class RedisTool(BaseMCPTool):
                 memory = await self.memory_service.get_agent_memory(session_id, agent_id)
                 return MCPToolResult(
                     success=True,
-                    data=memory.dict() if memory else None,
+                    data=memory.model_dump() if memory else None,
                     metadata={"operation": "get_agent_memory"}
                 )
             
@@ -127,7 +127,7 @@ class RedisTool(BaseMCPTool):
                 session = await self.memory_service.get_session(session_id)
                 return MCPToolResult(
                     success=True,
-                    data=session.dict() if session else None,
+                    data=session.model_dump() if session else None,
                     metadata={"operation": "get_session"}
                 )
             
@@ -146,7 +146,7 @@ class RedisTool(BaseMCPTool):
                 
                 return MCPToolResult(
                     success=True,
-                    data=[msg.dict() for msg in recent_messages],
+                    data=DEBATE_MESSAGE_LIST_ADAPTER.dump_python(recent_messages),
                     metadata={"operation": "get_recent_messages", "count": len(recent_messages)}
                 )
             
@@ -235,7 +235,7 @@ class AgentMemoryTool(BaseMCPTool):
     
     def __init__(self, memory_service: MemoryService):
         super().__init__(memory_service)
-        self.description = "Manage agent memory (update stance, add reasoning, track interactions)"
+        self.description = "Manage agent memory (update stance, add reasoning, track interactions, retrieve relevant memories)"
     
     async def execute(self, operation: str, **kwargs) -> MCPToolResult:
         """
@@ -246,6 +246,7 @@ class AgentMemoryTool(BaseMCPTool):
         - add_reasoning: Add reasoning to agent's memory
         - add_proposal: Add proposal to agent's memory
         - track_interaction: Track interaction with another agent
+        - retrieve: Rank remembered reasoning, proposals and interactions against a query
         """
         try:
             session_id = kwargs.get("session_id")
@@ -268,7 +269,22 @@ class AgentMemoryTool(BaseMCPTool):
                     last_updated=datetime.utcnow()
                 )
             
-            if operation == "update_stance":
+            if operation == "retrieve":
+                query = kwargs.get("query")
+                if not query:
+                    return MCPToolResult(
+                        success=False,
+                        error="Missing query parameter"
+                    )
+                
+                # Read-only: nothing to store
+                return MCPToolResult(
+                    success=True,
+                    data=memory.retrieve(query, kwargs.get("limit", 5)),
+                    metadata={"operation": operation, "query": query}
+                )
+            
+            elif operation == "update_stance":
                 new_stance = kwargs.get("stance")
                 if not new_stance:
                     return MCPToolResult(
@@ -326,7 +342,7 @@ class AgentMemoryTool(BaseMCPTool):
             
             return MCPToolResult(
                 success=True,
-                data=memory.dict(),
+                data=memory.model_dump(),
                 metadata={"operation": operation}
             )
         
@@ -369,9 +385,9 @@ class DebateHistoryTool(BaseMCPTool):
                 a2a_messages = await self.memory_service.get_a2a_messages(session_id)
                 
                 context = {
-                    "session": session.dict() if session else None,
-                    "messages": [msg.dict() for msg in messages],
-                    "a2a_messages": [msg.dict() for msg in a2a_messages],
+                    "session": session.model_dump() if session else None,
+                    "messages": DEBATE_MESSAGE_LIST_ADAPTER.dump_python(messages),
+                    "a2a_messages": A2A_MESSAGE_LIST_ADAPTER.dump_python(a2a_messages),
                     "message_count": len(messages),
                     "rounds": session.current_round if session else 0
                 }
@@ -398,7 +414,7 @@ class DebateHistoryTool(BaseMCPTool):
                 
                 return MCPToolResult(
                     success=True,
-                    data=[msg.dict() for msg in agent_messages],
+                    data=DEBATE_MESSAGE_LIST_ADAPTER.dump_python(agent_messages),
                     metadata={"operation": "get_agent_interactions", "target_agent": target_agent_id}
                 )
             
@@ -418,7 +434,7 @@ class DebateHistoryTool(BaseMCPTool):
                 
                 return MCPToolResult(
                     success=True,
-                    data=[msg.dict() for msg in round_messages],
+                    data=DEBATE_MESSAGE_LIST_ADAPTER.dump_python(round_messages),
                     metadata={"operation": "get_round_summary", "round": round_number}
                 )
             
@@ -6,19 +6,24 @@ import redis.asyncio as redis
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 from loguru import logger
-from typing import Dict, Any, List, Optional
-import json
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple, Union
+import orjson
 import asyncio
+import hashlib
 from datetime import datetime, timedelta
 
 from utils.config import get_settings
-from models.debate import DebateSession, AgentMemory, DebateContext, DebateMessage, A2AMessage
+from models.debate import (
+    Agent, DebateSession, AgentMemory, DebateContext, DebateMessage, A2AMessage, ns_to_iso, new_id, agent_template_json,
+    AGENT_LIST_ADAPTER, DEBATE_MESSAGE_LIST_ADAPTER, A2A_MESSAGE_LIST_ADAPTER
+)
 
 class MemoryService:
     """Service for managing memory operations with Redis and ChromaDB, with ADK integration"""
     
     def __init__(self):
         self.settings = get_settings()
+        self.redis_pool: Optional[redis.ConnectionPool] = None
         self.redis_client: Optional[redis.Redis] = None
         self.chroma_client: Optional[chromadb.Client] = None
         self.collections: Dict[str, Any] = {}
@@ -26,12 +31,14 @@ class MemoryService:
     async def initialize(self):
         """Initialize Redis and ChromaDB connections"""
         try:
-            # Initialize Redis connection
-            self.redis_client = redis.from_url(
+            # Initialize Redis connection pool shared by every operation
+            self.redis_pool = redis.ConnectionPool.from_url(
                 self.settings.redis_url,
+                max_connections=self.settings.redis_max_connections,
                 encoding="utf-8",
                 decode_responses=True
             )
+            self.redis_client = redis.Redis(connection_pool=self.redis_pool)
             
             # Test Redis connection
             await self.redis_client.ping()
@@ -40,8 +47,6 @@ class MemoryService:
             # Initialize ChromaDB connection
             if self.settings.is_development():
                 # Use embedded ChromaDB for development
-                import os
-                os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
                 self.chroma_client = chromadb.Client()
                 logger.info("Using embedded ChromaDB for development")
             else:
@@ -96,6 +101,11 @@ class MemoryService:
                 metadata={"description": "ADK orchestrator state snapshots"}
             )
             
+            self.collections["agent_templates"] = self.chroma_client.get_or_create_collection(
+                name="agent_templates",
+                metadata={"description": "Generated agent lineups keyed by scenario", "hnsw:space": "cosine"}
+            )
+            
             logger.info("ChromaDB collections created successfully (including ADK collections)")
             
         except Exception as e:
@@ -105,15 +115,16 @@ class MemoryService:
     async def cleanup(self):
         """Cleanup connections"""
         if self.redis_client:
-            await self.redis_client.close()
+            await self.redis_client.aclose()
+        if self.redis_pool:
+            await self.redis_pool.disconnect()
         logger.info("Memory service cleanup completed")
     
     async def check_redis_connection(self) -> bool:
         """Check Redis connection status"""
         try:
             if self.redis_client:
-                await self.redis_client.ping()
-                return True
+                return bool(await self.redis_client.ping())
             return False
         except Exception as e:
             logger.error(f"Redis connection check failed: {e}")
@@ -123,8 +134,8 @@ class MemoryService:
         """Check ChromaDB connection status"""
         try:
             if self.chroma_client:
-                # Try to get collection info
-                self.chroma_client.list_collections()
+                # Heartbeat is a no-op in embedded mode and a single GET against a server
+                await asyncio.to_thread(self.chroma_client.heartbeat)
                 return True
             return False
         except Exception as e:
@@ -137,11 +148,12 @@ class MemoryService:
         """Store debate session in Redis with ADK orchestrator state"""
         try:
             key = f"session:{session.id}"
-            data = session.dict()
+            # Messages live in their own debate_messages list; get_session re-attaches the recent window
+            data = session.model_dump(exclude={"messages"})
             await self.redis_client.setex(
                 key,
                 self.settings.memory_ttl_seconds,
-                json.dumps(data, default=str)
+                orjson.dumps(data, default=str)
             )
             
             # Store ADK orchestrator state separately if present
@@ -160,7 +172,7 @@ class MemoryService:
             await self.redis_client.setex(
                 key,
                 self.settings.memory_ttl_seconds,
-                json.dumps(state, default=str)
+                orjson.dumps(state, default=str)
             )
             logger.debug(f"Stored ADK orchestrator state for session {session_id}")
         except Exception as e:
@@ -173,7 +185,7 @@ class MemoryService:
             key = f"adk_orchestrator:{session_id}:{orchestrator_id}"
             data = await self.redis_client.get(key)
             if data:
-                return json.loads(data)
+                return orjson.loads(data)
             return None
         except Exception as e:
             logger.error(f"Error getting ADK orchestrator state: {e}")
@@ -186,7 +198,7 @@ class MemoryService:
             await self.redis_client.setex(
                 key,
                 self.settings.memory_ttl_seconds,
-                json.dumps(context, default=str)
+                orjson.dumps(context, default=str)
             )
         except Exception as e:
             logger.error(f"Error storing ADK agent context: {e}")
@@ -198,34 +210,73 @@ class MemoryService:
             key = f"adk_agent_context:{session_id}:{agent_id}"
             data = await self.redis_client.get(key)
             if data:
-                return json.loads(data)
+                return orjson.loads(data)
             return None
         except Exception as e:
             logger.error(f"Error getting ADK agent context: {e}")
             return None
 
     async def get_session(self, session_id: str) -> Optional[DebateSession]:
-        """Get debate session from Redis"""
+        """Get debate session from Redis with its most recent max_session_history messages"""
         try:
-            key = f"session:{session_id}"
-            data = await self.redis_client.get(key)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(f"session:{session_id}")
+                pipe.lrange(f"debate_messages:{session_id}", 0, self.settings.max_session_history - 1)
+                pipe.llen(f"debate_messages:{session_id}")
+                data, messages_data, message_count = await pipe.execute()
             if data:
-                session_data = json.loads(data)
-                return DebateSession(**session_data)
+                session = DebateSession(**orjson.loads(data))
+                # The list is newest first
+                session.messages = DEBATE_MESSAGE_LIST_ADAPTER.validate_json(f"[{','.join(reversed(messages_data))}]")
+                session.message_count = message_count
+                return session
             return None
         except Exception as e:
             logger.error(f"Error getting session: {e}")
             return None
     
+    async def list_sessions(self) -> List[DebateSession]:
+        """Get all debate sessions stored in Redis"""
+        try:
+            keys = [key async for key in self.redis_client.scan_iter(match="session:*")]
+            if not keys:
+                return []
+            values = await self.redis_client.mget(keys)
+            return [DebateSession(**orjson.loads(data)) for data in values if data]
+        except Exception as e:
+            logger.error(f"Error listing sessions: {e}")
+            return []
+    
+    # Redis Pub/Sub for cross-worker session updates
+    
+    async def publish_session_update(self, session_id: str, message: Union[Dict[str, Any], str]):
+        """Publish a session update (a dict or an already-encoded event) to every worker subscribed to the session channel"""
+        try:
+            payload = message if isinstance(message, str) else orjson.dumps(message)
+            await self.redis_client.publish(f"channel:session:{session_id}", payload)
+        except Exception as e:
+            logger.error(f"Error publishing session update: {e}")
+    
+    async def subscribe_session_updates(self) -> AsyncIterator[Tuple[str, str]]:
+        """Yield (session_id, encoded payload) for session updates published by any worker"""
+        pubsub = self.redis_client.pubsub()
+        await pubsub.psubscribe("channel:session:*")
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "pmessage":
+                    yield message["channel"].split(":", 2)[2], message["data"]
+        finally:
+            await pubsub.aclose()
+    
     async def store_agent_memory(self, memory: AgentMemory):
         """Store agent memory in Redis with ADK context"""
         try:
             key = f"agent_memory:{memory.session_id}:{memory.agent_id}"
-            data = memory.dict()
+            data = memory.model_dump()
             await self.redis_client.setex(
                 key,
                 self.settings.memory_ttl_seconds,
-                json.dumps(data, default=str)
+                orjson.dumps(data, default=str)
             )
         except Exception as e:
             logger.error(f"Error storing agent memory: {e}")
@@ -237,24 +288,37 @@ class MemoryService:
             key = f"agent_memory:{session_id}:{agent_id}"
             data = await self.redis_client.get(key)
             if data:
-                memory_data = json.loads(data)
+                memory_data = orjson.loads(data)
                 return AgentMemory(**memory_data)
             return None
         except Exception as e:
             logger.error(f"Error getting agent memory: {e}")
             return None
     
+    async def get_agent_memories(self, session_id: str, agent_ids: List[str]) -> Dict[str, AgentMemory]:
+        """Get the stored memories of several agents in one round trip, keyed by agent ID"""
+        try:
+            if not agent_ids:
+                return {}
+            values = await self.redis_client.mget([f"agent_memory:{session_id}:{agent_id}" for agent_id in agent_ids])
+            return {
+                agent_id: AgentMemory(**orjson.loads(data))
+                for agent_id, data in zip(agent_ids, values)
+                if data
+            }
+        except Exception as e:
+            logger.error(f"Error getting agent memories: {e}")
+            return {}
+    
     async def store_debate_message(self, message: DebateMessage):
         """Store debate message in Redis for active session"""
         try:
             key = f"debate_messages:{message.session_id}"
-            # Store in Redis list for active session
-            await self.redis_client.lpush(
-                key,
-                json.dumps(message.dict(), default=str)
-            )
-            # Set TTL for the list
-            await self.redis_client.expire(key, self.settings.memory_ttl_seconds)
+            # Push onto the session's list and refresh its TTL in one round trip
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.lpush(key, orjson.dumps(message.model_dump(), default=str))
+                pipe.expire(key, self.settings.memory_ttl_seconds)
+                await pipe.execute()
         except Exception as e:
             logger.error(f"Error storing debate message: {e}")
             raise
@@ -263,11 +327,10 @@ class MemoryService:
         """Store A2A protocol message in Redis for active session"""
         try:
             key = f"a2a_messages:{session_id}"
-            await self.redis_client.lpush(
-                key,
-                json.dumps(message.dict(), default=str)
-            )
-            await self.redis_client.expire(key, self.settings.memory_ttl_seconds)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.lpush(key, orjson.dumps(message.model_dump(), default=str))
+                pipe.expire(key, self.settings.memory_ttl_seconds)
+                await pipe.execute()
             logger.debug(f"Stored A2A message from {message.sender} in session {session_id}")
         except Exception as e:
             logger.error(f"Error storing A2A message: {e}")
@@ -278,25 +341,57 @@ class MemoryService:
         try:
             key = f"a2a_messages:{session_id}"
             messages_data = await self.redis_client.lrange(key, 0, limit - 1)
-            messages = []
-            for msg_data in messages_data:
-                msg_dict = json.loads(msg_data)
-                messages.append(A2AMessage(**msg_dict))
-            return messages
+            # Entries are already JSON, so validate them as one array in a single pass
+            return A2A_MESSAGE_LIST_ADAPTER.validate_json(f"[{','.join(messages_data)}]")
         except Exception as e:
             logger.error(f"Error getting A2A messages: {e}")
             return []
 
+    async def session_exists(self, session_id: str) -> bool:
+        """Check whether a session is stored in Redis without loading it"""
+        try:
+            return bool(await self.redis_client.exists(f"session:{session_id}"))
+        except Exception as e:
+            logger.error(f"Error checking session: {e}")
+            return False
+    
+    async def get_session_messages_page(self, session_id: str, after: int = 0, limit: Optional[int] = None) -> Tuple[List[DebateMessage], int]:
+        """
+        Get a page of a session's messages in chronological order, skipping the first `after`.
+        Returns the page and the total number of stored messages. Errors propagate so callers
+        do not mistake a Redis failure for an empty log.
+        """
+        try:
+            key = f"debate_messages:{session_id}"
+            if limit is not None and limit <= 0:
+                return [], await self.redis_client.llen(key)
+            # The list is newest first, so chronological index i is list index -(i + 1)
+            start = 0 if limit is None else -(after + limit)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.llen(key)
+                pipe.lrange(key, start, -(after + 1))
+                total, messages_data = await pipe.execute()
+            return DEBATE_MESSAGE_LIST_ADAPTER.validate_json(f"[{','.join(reversed(messages_data))}]"), total
+        except Exception as e:
+            logger.error(f"Error getting session messages page: {e}")
+            raise
+    
+    async def keep_session_alive(self, session_id: str):
+        """Refresh the TTL of a session and its message log while a worker still hosts it"""
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.expire(f"session:{session_id}", self.settings.memory_ttl_seconds)
+                pipe.expire(f"debate_messages:{session_id}", self.settings.memory_ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not refresh TTL for session {session_id}: {e}")
+
     async def get_session_messages(self, session_id: str) -> List[DebateMessage]:
         """Get all messages for a session from Redis"""
         try:
             key = f"debate_messages:{session_id}"
             messages_data = await self.redis_client.lrange(key, 0, -1)
-            messages = []
-            for msg_data in messages_data:
-                msg_dict = json.loads(msg_data)
-                messages.append(DebateMessage(**msg_dict))
-            return messages
+            return DEBATE_MESSAGE_LIST_ADAPTER.validate_json(f"[{','.join(messages_data)}]")
         except Exception as e:
             logger.error(f"Error getting session messages: {e}")
             return []
@@ -323,7 +418,7 @@ class MemoryService:
             
             # Store session data
             collection.add(
-                documents=[json.dumps(session.dict(), default=str)],
+                documents=[orjson.dumps(session.model_dump(), default=str).decode()],
                 metadatas=[metadata],
                 ids=[session.id]
             )
@@ -344,7 +439,7 @@ class MemoryService:
                 "message_type": message.message_type,
                 "sender": message.sender,
                 "receiver": message.receiver or "broadcast",
-                "timestamp": message.timestamp.isoformat(),
+                "timestamp": ns_to_iso(message.timestamp),
                 "has_correlation_id": bool(message.correlation_id)
             }
             
@@ -380,7 +475,7 @@ class MemoryService:
             Past Proposals: {'; '.join(memory.past_proposals)}
             Past Reasoning: {'; '.join(memory.past_reasoning)}
             Goals Achieved: {'; '.join(memory.goals_achieved)}
-            ADK Context: {json.dumps(memory.adk_context)}
+            ADK Context: {orjson.dumps(memory.adk_context).decode()}
             """
             
             collection.add(
@@ -395,29 +490,100 @@ class MemoryService:
 
     async def store_debate_message_history(self, message: DebateMessage):
         """Store debate message in ChromaDB with A2A correlation"""
+        await self.store_debate_messages_history([message])
+    
+    async def store_debate_messages_history(self, messages: List[DebateMessage]):
+        """Store a batch of debate messages (typically one round) in ChromaDB with a single add"""
+        if not messages:
+            return
         try:
             collection = self.collections["debate_messages"]
             
-            metadata = {
-                "session_id": message.session_id,
-                "agent_id": message.agent_id,
-                "agent_name": message.agent_name,
-                "message_type": message.message_type,
-                "round_number": message.round_number,
-                "timestamp": message.timestamp.isoformat(),
-                "has_a2a_correlation": bool(message.a2a_correlation_id)
-            }
+            metadatas = [
+                {
+                    "session_id": message.session_id,
+                    "agent_id": message.agent_id,
+                    "agent_name": message.agent_name,
+                    "message_type": message.message_type,
+                    "round_number": message.round_number,
+                    "timestamp": ns_to_iso(message.timestamp),
+                    "has_a2a_correlation": bool(message.a2a_correlation_id)
+                }
+                for message in messages
+            ]
             
-            collection.add(
-                documents=[message.content],
-                metadatas=[metadata],
-                ids=[message.id]
+            # Embedding happens inside add, so keep it off the event loop
+            await asyncio.to_thread(
+                collection.add,
+                documents=[message.content for message in messages],
+                metadatas=metadatas,
+                ids=[message.id for message in messages]
             )
             
         except Exception as e:
             logger.error(f"Error storing debate message history: {e}")
             raise
 
+    async def store_agent_template(self, scenario: str, agents: List[Agent]):
+        """Remember a generated agent lineup so near-identical scenarios can skip the LLM"""
+        try:
+            collection = self.collections["agent_templates"]
+            template = agent_template_json(agents).decode()
+            
+            await asyncio.to_thread(
+                collection.add,
+                documents=[scenario],
+                metadatas=[{"agent_count": len(agents), "agents": template}],
+                ids=[new_id()]
+            )
+            
+        except Exception as e:
+            logger.error(f"Error storing agent template: {e}")
+
+    async def store_exact_agent_template(self, scenario: str, agent_count: int, template: bytes):
+        """Keep an agent template in Redis under its exact scenario so repeats survive restarts without an embedding"""
+        try:
+            await self.redis_client.setex(
+                self._agent_template_key(scenario, agent_count),
+                self.settings.agent_cache_ttl_seconds,
+                template
+            )
+        except Exception as e:
+            logger.error(f"Error storing exact agent template: {e}")
+
+    async def get_exact_agent_template(self, scenario: str, agent_count: int) -> Optional[str]:
+        """Agent template JSON previously generated for exactly this scenario and lineup size"""
+        try:
+            return await self.redis_client.get(self._agent_template_key(scenario, agent_count))
+        except Exception as e:
+            logger.error(f"Error getting exact agent template: {e}")
+            return None
+
+    @staticmethod
+    def _agent_template_key(scenario: str, agent_count: int) -> str:
+        """Hash the scenario so arbitrary-length user text makes a bounded Redis key"""
+        return f"agent_template:{agent_count}:{hashlib.sha256(scenario.encode()).hexdigest()}"
+
+    async def find_agent_template(self, scenario: str, agent_count: int, max_distance: float) -> Optional[List[Agent]]:
+        """Agents generated for the closest cached scenario with the same lineup size, if it is close enough"""
+        try:
+            collection = self.collections["agent_templates"]
+            results = await asyncio.to_thread(
+                collection.query,
+                query_texts=[scenario],
+                n_results=1,
+                where={"agent_count": agent_count}
+            )
+            
+            if not results["ids"][0] or results["distances"][0][0] > max_distance:
+                return None
+            # Validation assigns every agent a fresh id
+            return AGENT_LIST_ADAPTER.validate_json(results["metadatas"][0][0]["agents"])
+            
+        except Exception as e:
+            logger.error(f"Error looking up agent template: {e}")
+            return None
+
     async def search_session_history(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search session history in ChromaDB"""
         try:
@@ -512,14 +678,14 @@ class MemoryService:
                 f"agent_memory:{session_id}:*"
             ]
             
+            keys = []
             for key_pattern in keys_to_delete:
                 if "*" in key_pattern:
                     # Handle wildcard patterns
-                    keys = await self.redis_client.keys(key_pattern)
-                    if keys:
-                        await self.redis_client.delete(*keys)
+                    keys.extend(await self.redis_client.keys(key_pattern))
                 else:
-                    await self.redis_client.delete(key_pattern)
+                    keys.append(key_pattern)
+            await self.redis_client.delete(*keys)
             
             logger.info(f"Cleared session data for {session_id}")
             
@@ -3,8 +3,9 @@ Configuration management for the Multi-Agent Negotiation Framework with ADK supp
 """
 
 from pydantic import Field
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional, Dict, Any, List
+from functools import lru_cache
 import os
 
 class Settings(BaseSettings):
@@ -26,6 +27,7 @@ class Settings(BaseSettings):
     redis_url: str = Field(default="redis://localhost:6379", env="REDIS_URL")
     redis_password: Optional[str] = Field(default=None, env="REDIS_PASSWORD")
     redis_db: int = Field(default=0, env="REDIS_DB")
+    redis_max_connections: int = Field(default=64, env="REDIS_MAX_CONNECTIONS")
     
     # ChromaDB Settings
     chroma_host: str = Field(default="localhost", env="CHROMA_HOST")
@@ -35,31 +37,42 @@ class Settings(BaseSettings):
     # Memory Settings
     memory_ttl_seconds: int = Field(default=3600, env="MEMORY_TTL_SECONDS")  # 1 hour
     max_session_history: int = Field(default=1000, env="MAX_SESSION_HISTORY")
+    memory_preload_count: int = Field(default=5, env="MEMORY_PRELOAD_COUNT")  # Memories recalled per agent at debate start
+    agent_cache_enabled: bool = Field(default=True, env="AGENT_CACHE_ENABLED")  # Reuse agents generated for near-identical scenarios
+    agent_cache_max_distance: float = Field(default=0.08, env="AGENT_CACHE_MAX_DISTANCE")  # Cosine distance to count as the same scenario
+    agent_cache_size: int = Field(default=256, env="AGENT_CACHE_SIZE")  # Exact-match lineups kept in process
+    agent_cache_ttl_seconds: int = Field(default=86400, env="AGENT_CACHE_TTL_SECONDS")  # Exact-match lineups kept in Redis
     
     # Multi-LLM Provider Settings
     # OpenAI Configuration
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
     openai_organization: Optional[str] = Field(default=None, env="OPENAI_ORGANIZATION")
     openai_default_model: str = Field(default="gpt-4", env="OPENAI_DEFAULT_MODEL")
+    openai_agent_generation_model: str = Field(default="gpt-4o-mini", env="OPENAI_AGENT_GENERATION_MODEL")
     openai_temperature: float = Field(default=0.7, env="OPENAI_TEMPERATURE")
     openai_max_tokens: int = Field(default=2048, env="OPENAI_MAX_TOKENS")
     openai_timeout: int = Field(default=60, env="OPENAI_TIMEOUT")
+    openai_max_concurrency: int = Field(default=8, env="OPENAI_MAX_CONCURRENCY")  # In-flight OpenAI calls across all sessions
     
     # Anthropic Configuration
     anthropic_api_key: Optional[str] = Field(default=None, env="ANTHROPIC_API_KEY")
     anthropic_default_model: str = Field(default="claude-3-5-sonnet-20241022", env="ANTHROPIC_DEFAULT_MODEL")
+    anthropic_agent_generation_model: str = Field(default="claude-3-5-haiku-20241022", env="ANTHROPIC_AGENT_GENERATION_MODEL")
     anthropic_temperature: float = Field(default=0.7, env="ANTHROPIC_TEMPERATURE")
     anthropic_max_tokens: int = Field(default=2048, env="ANTHROPIC_MAX_TOKENS")
     anthropic_timeout: int = Field(default=60, env="ANTHROPIC_TIMEOUT")
+    anthropic_max_concurrency: int = Field(default=8, env="ANTHROPIC_MAX_CONCURRENCY")  # In-flight Anthropic calls across all sessions
     
     # Google/Gemini Configuration
     google_api_key: Optional[str] = Field(default=None, env="GOOGLE_API_KEY")
     google_project_id: Optional[str] = Field(default=None, env="GOOGLE_PROJECT_ID")
     google_location: str = Field(default="us-central1", env="GOOGLE_LOCATION")
     google_default_model: str = Field(default="gemini-2.0-flash", env="GOOGLE_DEFAULT_MODEL")
+    google_agent_generation_model: str = Field(default="gemini-2.0-flash", env="GOOGLE_AGENT_GENERATION_MODEL")
     google_temperature: float = Field(default=0.7, env="GOOGLE_TEMPERATURE")
     google_max_tokens: int = Field(default=2048, env="GOOGLE_MAX_TOKENS")
     google_timeout: int = Field(default=60, env="GOOGLE_TIMEOUT")
+    google_max_concurrency: int = Field(default=8, env="GOOGLE_MAX_CONCURRENCY")  # In-flight Gemini calls across all sessions
     use_vertex_ai: bool = Field(default=False, env="GOOGLE_GENAI_USE_VERTEXAI")
     
     # LLM Provider Selection
@@ -70,6 +83,12 @@ class Settings(BaseSettings):
     # LLM Selection Strategy
     llm_selection_strategy: str = Field(default="orchestrator_choice", env="LLM_SELECTION_STRATEGY")  # orchestrator_choice, random, round_robin
     llm_diversity_preference: float = Field(default=0.8, env="LLM_DIVERSITY_PREFERENCE")  # 0.0 = no diversity, 1.0 = max diversity
+    llm_max_concurrent_requests: int = Field(default=4, env="LLM_MAX_CONCURRENT_REQUESTS")  # In-flight calls for fan-out work
+    llm_hedge_delay: float = Field(default=5.0, env="LLM_HEDGE_DELAY")  # Seconds before a slow provider is hedged with the next one
+    llm_breaker_threshold: int = Field(default=3, env="LLM_BREAKER_THRESHOLD")  # Consecutive failures before a provider is skipped
+    llm_breaker_cooldown: float = Field(default=30.0, env="LLM_BREAKER_COOLDOWN")  # Base seconds a tripped provider is skipped (doubles per further failure)
+    llm_max_connections: int = Field(default=64, env="LLM_MAX_CONNECTIONS")  # Process-wide HTTP connections to the OpenAI/Anthropic APIs
+    llm_max_keepalive_connections: int = Field(default=32, env="LLM_MAX_KEEPALIVE_CONNECTIONS")  # Idle connections kept open between calls
     
     # ADK Model Configuration
     adk_model_name: str = Field(default="gemini-2.0-flash", env="ADK_MODEL_NAME")
@@ -108,6 +127,8 @@ class Settings(BaseSettings):
     debate_consensus_threshold: float = Field(default=0.7, env="DEBATE_CONSENSUS_THRESHOLD")
     debate_turn_timeout: int = Field(default=120, env="DEBATE_TURN_TIMEOUT")  # 2 minutes
     debate_auto_consensus_check: bool = Field(default=True, env="DEBATE_AUTO_CONSENSUS_CHECK")
+    debate_stream_interval: float = Field(default=0.25, env="DEBATE_STREAM_INTERVAL")  # Seconds between agent_typing events while a turn streams
+    debate_min_consensus_rounds: int = Field(default=1, env="DEBATE_MIN_CONSENSUS_ROUNDS")  # Rounds played before consensus is first evaluated
     
     # Consensus Settings
     consensus_method: str = Field(default="simple_majority", env="CONSENSUS_METHOD")  # simple_majority, borda_count, delphi
@@ -119,6 +140,12 @@ class Settings(BaseSettings):
     websocket_heartbeat: int = Field(default=30, env="WEBSOCKET_HEARTBEAT")
     websocket_max_connections: int = Field(default=100, env="WEBSOCKET_MAX_CONNECTIONS")
     websocket_message_queue_size: int = Field(default=1000, env="WEBSOCKET_MESSAGE_QUEUE_SIZE")
+    websocket_batch_window: float = Field(default=0.02, env="WEBSOCKET_BATCH_WINDOW")  # Seconds to coalesce updates
+    websocket_max_queue: int = Field(default=32, env="WEBSOCKET_MAX_QUEUE")  # Inbound frames buffered per connection
+    websocket_max_size: int = Field(default=1_048_576, env="WEBSOCKET_MAX_SIZE")  # Largest inbound frame in bytes
+    
+    # Health Check Settings
+    health_check_interval: int = Field(default=5, env="HEALTH_CHECK_INTERVAL")  # Seconds between backend probes
     
     # Logging Settings
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
@@ -150,10 +177,11 @@ class Settings(BaseSettings):
     mock_llm_responses: bool = Field(default=False, env="MOCK_LLM_RESPONSES")
     enable_debug_endpoints: bool = Field(default=False, env="ENABLE_DEBUG_ENDPOINTS")
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+    )
     
     def get_adk_model_config(self) -> Dict[str, Any]:
         """Get ADK model configuration as a dictionary"""
@@ -200,6 +228,8 @@ class Settings(BaseSettings):
             "consensus_threshold": self.debate_consensus_threshold,
             "turn_timeout": self.debate_turn_timeout,
             "auto_consensus_check": self.debate_auto_consensus_check,
+            "min_consensus_rounds": self.debate_min_consensus_rounds,
+            "stream_interval": self.debate_stream_interval,
         }
     
     def get_consensus_config(self) -> Dict[str, Any]:
@@ -242,6 +272,7 @@ class Settings(BaseSettings):
                 "temperature": self.openai_temperature,
                 "max_tokens": self.openai_max_tokens,
                 "timeout": self.openai_timeout,
+                "max_concurrency": self.openai_max_concurrency,
                 "provider": "openai"
             }
         elif provider == "anthropic":
@@ -251,6 +282,7 @@ class Settings(BaseSettings):
                 "temperature": self.anthropic_temperature,
                 "max_tokens": self.anthropic_max_tokens,
                 "timeout": self.anthropic_timeout,
+                "max_concurrency": self.anthropic_max_concurrency,
                 "provider": "anthropic"
             }
         elif provider == "google":
@@ -262,12 +294,24 @@ class Settings(BaseSettings):
                 "temperature": self.google_temperature,
                 "max_tokens": self.google_max_tokens,
                 "timeout": self.google_timeout,
+                "max_concurrency": self.google_max_concurrency,
                 "use_vertex_ai": self.use_vertex_ai,
                 "provider": "google"
             }
         else:
             raise ValueError(f"Unknown LLM provider: {provider}")
     
+    def get_agent_generation_model(self, provider: str) -> str:
+        """Smaller model used for the structured agent generation call, separate from the debate model"""
+        if provider == "openai":
+            return self.openai_agent_generation_model
+        elif provider == "anthropic":
+            return self.anthropic_agent_generation_model
+        elif provider == "google":
+            return self.google_agent_generation_model
+        else:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+    
     def get_available_llm_providers(self) -> List[str]:
         """Get list of available and configured LLM providers"""
         available = []
@@ -311,18 +355,12 @@ class Settings(BaseSettings):
             }
         }
 
-# Global settings instance
-_settings: Optional[Settings] = None
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get application settings singleton"""
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    return Settings()
 
 def reload_settings() -> Settings:
     """Reload settings from environment"""
-    global _settings
-    _settings = Settings()
-    return _settings 
\ No newline at end of file
+    get_settings.cache_clear()
+    return get_settings()
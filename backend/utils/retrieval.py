@@ -0,0 +1,39 @@
+"""
+Lightweight lexical ranking for agent memory retrieval
+"""
+
+from collections import Counter
+from typing import List
+import math
+import re
+
+_TOKEN_RE = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+def bm25_scores(query: str, documents: List[str], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """Okapi BM25 score of every document against the query, normalized to 0..1"""
+    if not documents:
+        return []
+
+    query_terms = set(tokenize(query))
+    doc_terms = [tokenize(doc) for doc in documents]
+    avg_len = sum(len(terms) for terms in doc_terms) / len(doc_terms) or 1.0
+    doc_freq = Counter(term for terms in doc_terms for term in set(terms) if term in query_terms)
+
+    scores = []
+    for terms in doc_terms:
+        term_freq = Counter(terms)
+        length_norm = k1 * (1 - b + b * len(terms) / avg_len)
+        score = 0.0
+        for term in query_terms:
+            tf = term_freq.get(term)
+            if tf:
+                idf = math.log(1 + (len(documents) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + length_norm)
+        scores.append(score)
+
+    top = max(scores)
+    return [score / top for score in scores] if top > 0 else scores
@@ -1,6 +1,8 @@
 import React, { useState, useEffect, useRef } from 'react'
 import { Sparkles, Play, RefreshCw, Users, Brain, MessageSquare } from 'lucide-react'
 
+const textDecoder = new TextDecoder()
+
 interface Agent {
   id: string
   name: string
@@ -43,7 +45,9 @@ const AgentStudio: React.FC<AgentStudioProps> = ({ onStartDebate }) => {
     // For AgentStudio, we'll connect to a general WebSocket for now
     // In a real implementation, this could be session-specific
     const wsUrl = `ws://localhost:8000/ws/agent-studio`
-    socketRef.current = new WebSocket(wsUrl)
+    // Ask for binary frames so the server can send its pre-encoded UTF-8 JSON as-is
+    socketRef.current = new WebSocket(wsUrl, ['json.binary'])
+    socketRef.current.binaryType = 'arraybuffer'
 
     socketRef.current.onopen = () => {
       setIsConnected(true)
@@ -57,25 +61,30 @@ const AgentStudio: React.FC<AgentStudioProps> = ({ onStartDebate }) => {
 
     socketRef.current.onmessage = (event) => {
       try {
-        const data = JSON.parse(event.data)
+        const text = event.data instanceof ArrayBuffer ? textDecoder.decode(event.data) : event.data
+        const parsed = JSON.parse(text)
+        // Bursts of updates arrive batched as a single JSON array
+        const events = Array.isArray(parsed) ? parsed : [parsed]
         
-        switch (data.type) {
-          case 'agent_generation_progress':
-            setGenerationProgress(data.progress)
-            break
-          case 'agents_generated':
-            setAgents(data.agents)
-            setCurrentSessionId(data.session_id)
-            setGenerationProgress(0)
-            setLoading(false)
-            break
-          case 'agent_generation_error':
-            console.error('Agent generation error:', data.error)
-            setLoading(false)
-            setGenerationProgress(0)
-            break
-          default:
-            console.log('Unknown message type:', data.type)
+        for (const data of events) {
+          switch (data.type) {
+            case 'agent_generation_progress':
+              setGenerationProgress(data.progress)
+              break
+            case 'agents_generated':
+              setAgents(data.agents)
+              setCurrentSessionId(data.session_id)
+              setGenerationProgress(0)
+              setLoading(false)
+              break
+            case 'agent_generation_error':
+              console.error('Agent generation error:', data.error)
+              setLoading(false)
+              setGenerationProgress(0)
+              break
+            default:
+              console.log('Unknown message type:', data.type)
+          }
         }
       } catch (error) {
         console.error('Error parsing WebSocket message:', error)
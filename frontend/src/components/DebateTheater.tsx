@@ -1,6 +1,8 @@
 import React, { useState, useEffect, useRef } from 'react'
 import { MessageSquare, Users, Clock, Activity, Play, Pause, RotateCcw } from 'lucide-react'
 
+const textDecoder = new TextDecoder()
+
 interface DebateMessage {
   id: string
   agent_name: string
@@ -10,6 +12,13 @@ interface DebateMessage {
   agent_id: string
 }
 
+// Text an agent has streamed so far in the current round
+interface AgentDraft {
+  agent_name: string
+  round_number: number
+  content: string
+}
+
 interface DebateSession {
   session_id: string
   scenario: string
@@ -26,6 +35,7 @@ interface DebateTheaterProps {
 const DebateTheater: React.FC<DebateTheaterProps> = ({ sessionId }) => {
   const [session, setSession] = useState<DebateSession | null>(null)
   const [messages, setMessages] = useState<DebateMessage[]>([])
+  const [drafts, setDrafts] = useState<Record<string, AgentDraft>>({})
   const [loading, setLoading] = useState(false)
   const [isConnected, setIsConnected] = useState(false)
   const socketRef = useRef<WebSocket | null>(null)
@@ -49,14 +59,16 @@ const DebateTheater: React.FC<DebateTheaterProps> = ({ sessionId }) => {
   // Auto-scroll to bottom when new messages arrive
   useEffect(() => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' })
-  }, [messages])
+  }, [messages, drafts])
 
   const initializeWebSocket = () => {
     if (!sessionId) return
 
     // Connect to backend WebSocket
     const wsUrl = `ws://localhost:8000/ws/${sessionId}`
-    socketRef.current = new WebSocket(wsUrl)
+    // Ask for binary frames so the server can send its pre-encoded UTF-8 JSON as-is
+    socketRef.current = new WebSocket(wsUrl, ['json.binary'])
+    socketRef.current.binaryType = 'arraybuffer'
 
     socketRef.current.onopen = () => {
       setIsConnected(true)
@@ -70,26 +82,43 @@ const DebateTheater: React.FC<DebateTheaterProps> = ({ sessionId }) => {
 
     socketRef.current.onmessage = (event) => {
       try {
-        const data = JSON.parse(event.data)
+        const text = event.data instanceof ArrayBuffer ? textDecoder.decode(event.data) : event.data
+        const parsed = JSON.parse(text)
+        // Bursts of updates arrive batched as a single JSON array
+        const events = Array.isArray(parsed) ? parsed : [parsed]
         
-        switch (data.type) {
-          case 'debate_message':
-            setMessages(prev => [...prev, data.message])
-            break
-          case 'session_update':
-            setSession(prev => prev ? { ...prev, ...data } : null)
-            break
-          case 'consensus_reached':
-            setSession(prev => prev ? { ...prev, consensus_reached: true } : null)
-            break
-          case 'round_update':
-            setSession(prev => prev ? { ...prev, current_round: data.round_number } : null)
-            break
-          case 'agent_typing':
-            console.log(`${data.agent_name} is typing...`)
-            break
-          default:
-            console.log('Unknown message type:', data.type)
+        for (const data of events) {
+          switch (data.type) {
+            case 'debate_message':
+              setMessages(prev => prev.some(m => m.id === data.message.id) ? prev : [...prev, data.message])
+              setDrafts(prev => {
+                const next = { ...prev }
+                delete next[data.message.agent_id]
+                return next
+              })
+              break
+            case 'session_update':
+              setSession(prev => prev ? { ...prev, ...data } : null)
+              break
+            case 'consensus_reached':
+              setSession(prev => prev ? { ...prev, consensus_reached: true } : null)
+              break
+            case 'round_update':
+              setSession(prev => prev ? { ...prev, current_round: data.round_number } : null)
+              break
+            case 'agent_typing':
+              setDrafts(prev => ({
+                ...prev,
+                [data.agent_id]: {
+                  agent_name: data.agent_name,
+                  round_number: data.round_number,
+                  content: (prev[data.agent_id]?.content ?? '') + data.delta,
+                },
+              }))
+              break
+            default:
+              console.log('Unknown message type:', data.type)
+          }
         }
       } catch (error) {
         console.error('Error parsing WebSocket message:', error)
@@ -306,7 +335,7 @@ const DebateTheater: React.FC<DebateTheaterProps> = ({ sessionId }) => {
               Debate Messages
             </h3>
             
-            {messages.length > 0 ? (
+            {messages.length > 0 || Object.keys(drafts).length > 0 ? (
               <div className="space-y-4 max-h-96 overflow-y-auto">
                 {messages.map((message) => (
                   <div key={message.id} className="border-l-2 border-primary-200 pl-4 py-2 animate-fade-in">
@@ -320,6 +349,18 @@ const DebateTheater: React.FC<DebateTheaterProps> = ({ sessionId }) => {
                     <p className="text-gray-700">{message.content}</p>
                   </div>
                 ))}
+                {Object.entries(drafts).map(([agentId, draft]) => (
+                  <div key={`draft-${agentId}`} className="border-l-2 border-gray-200 pl-4 py-2">
+                    <div className="flex items-center justify-between mb-2">
+                      <div className="flex items-center space-x-2">
+                        <span className="font-medium text-gray-900">{draft.agent_name}</span>
+                        <span className="text-xs text-gray-500">Round {draft.round_number}</span>
+                      </div>
+                      <span className="text-xs text-gray-500">typing...</span>
+                    </div>
+                    <p className="text-gray-500">{draft.content}</p>
+                  </div>
+                ))}
                 <div ref={messagesEndRef} />
               </div>
             ) : (
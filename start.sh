@@ -22,7 +22,7 @@ trap cleanup SIGINT SIGTERM
 # Start backend server
 echo "🔧 Starting Backend Server (FastAPI)..."
 cd backend
-python -m uvicorn main:app --reload --host 0.0.0.0 --port 8000 &
+python -m uvicorn main:app --reload --host 0.0.0.0 --port 8000 --loop uvloop --http httptools --ws websockets --ws-max-queue 32 --ws-max-size 1048576 &
 backend_pid=$!
 cd ..
 